@@ -0,0 +1,92 @@
+# Stdlib imports
+import zlib
+
+# Django imports
+from django import forms
+from django.db import models
+from django.db.models.query_utils import DeferredAttribute
+
+
+# Text is written rarely and read often, so the best compression is used
+COMPRESSION_LEVEL = 9
+
+
+def compress_text(value):
+    return zlib.compress(value.encode('utf-8'), COMPRESSION_LEVEL)
+
+
+def decompress_text(value):
+    return zlib.decompress(bytes(value)).decode('utf-8')
+
+
+class DecompressingAttribute(DeferredAttribute):
+    """
+    Keeps value loaded from db compressed in the instance until it is accessed for the first time.
+    It is a data descriptor, so it is called even when the value is already in the instance dict
+    """
+
+    def __set__(self, instance, value):
+        instance.__dict__[self.field_name] = value
+
+    def __get__(self, instance, cls=None):
+        if instance is None:
+            return self
+
+        value = super().__get__(instance, cls)
+        if isinstance(value, (bytes, memoryview)):
+            value = decompress_text(value)
+            instance.__dict__[self.field_name] = value
+
+        return value
+
+
+class CompressedTextField(models.BinaryField):
+    """
+    Text stored in db compressed with zlib. Python side always works with str,
+    the value is decompressed lazily on access, so rows fetched without touching the text don't pay for it.
+    Use defer() to not load it from db at all.
+
+    Lookups by the content are not supported, the column holds compressed bytes
+    """
+
+    description = "Text compressed with zlib"
+
+    def __init__(self, *args, **kwargs):
+        kwargs.setdefault('editable', True)
+        super().__init__(*args, **kwargs)
+
+    def deconstruct(self):
+        name, path, args, kwargs = super().deconstruct()
+        if self.editable:
+            kwargs.pop('editable', None)
+        else:
+            kwargs['editable'] = False
+        return name, path, args, kwargs
+
+    def contribute_to_class(self, cls, name, **kwargs):
+        super().contribute_to_class(cls, name, **kwargs)
+        setattr(cls, self.attname, DecompressingAttribute(self.attname))
+
+    def pre_save(self, model_instance, add):
+        # Values which were not accessed are written back compressed, as they were loaded
+        return model_instance.__dict__.get(self.attname)
+
+    def get_db_prep_value(self, value, connection, prepared=False):
+        if isinstance(value, str):
+            value = compress_text(value)
+        return super().get_db_prep_value(value, connection, prepared)
+
+    def to_python(self, value):
+        if isinstance(value, (bytes, memoryview)):
+            return decompress_text(value)
+        return value
+
+    def value_to_string(self, obj):
+        return self.value_from_object(obj)
+
+    def formfield(self, **kwargs):
+        # BinaryField has no form field, the text is edited as any other TextField
+        return super(models.BinaryField, self).formfield(**{
+            'widget': forms.Textarea,
+            **kwargs,
+        })
@@ -0,0 +1,81 @@
+# Stdlib imports
+import time
+
+# Project imports
+from .redis_client import get_redis
+
+
+# Takes tokens from the bucket, the bucket is refilled to capacity when its window is over.
+# Returns "0" if tokens are taken, otherwise seconds to wait till the window reset
+ACQUIRE_SCRIPT = """
+local capacity = tonumber(ARGV[1])
+local window = tonumber(ARGV[2])
+local now = tonumber(ARGV[3])
+local requested = tonumber(ARGV[4])
+
+local tokens = tonumber(redis.call('HGET', KEYS[1], 'tokens'))
+local reset_at = tonumber(redis.call('HGET', KEYS[1], 'reset_at'))
+
+if tokens == nil or reset_at == nil or now >= reset_at then
+    tokens = capacity
+    reset_at = now + window
+end
+
+local wait = 0
+if tokens >= requested then
+    tokens = tokens - requested
+else
+    wait = reset_at - now
+end
+
+redis.call('HMSET', KEYS[1], 'tokens', tokens, 'reset_at', reset_at)
+redis.call('EXPIRE', KEYS[1], math.ceil(reset_at - now + window))
+
+return tostring(wait)
+"""
+
+
+class TokenBucket:
+    """
+    Rate limiter shared between processes through redis. The bucket holds the amount of requests
+    left in the current window of API, e.g. 900 requests per 15 minutes of Twitter.
+
+    Remote API is the source of truth: after every response the bucket is synced with
+    the remaining amount and the reset time which API reported in headers
+    """
+
+    key_prefix = 'rate_limit:'
+
+    def __init__(self, name, capacity, window):
+        """
+        :param name: name of limited resource, e.g. twitter:statuses/lookup
+        :param capacity: amount of requests per window
+        :param window: length of window in seconds
+        """
+        self.key = self.key_prefix + name
+        self.capacity = capacity
+        self.window = window
+        self._acquire = get_redis().register_script(ACQUIRE_SCRIPT)
+
+    def acquire(self, tokens=1):
+        """
+        Takes tokens if the bucket has them
+
+        :param tokens: amount of requests
+        :return: (float) 0 if tokens are taken, otherwise seconds till the bucket is refilled
+        """
+        wait = self._acquire(keys=[self.key], args=[self.capacity, self.window, time.time(), tokens])
+        return float(wait)
+
+    def sync(self, remaining, reset_at):
+        """
+        Sets the state of the bucket reported by API
+
+        :param remaining: amount of requests left in the window
+        :param reset_at: epoch time when the window is over
+        :return:
+        """
+        pipe = get_redis().pipeline()
+        pipe.hmset(self.key, {'tokens': remaining, 'reset_at': reset_at})
+        pipe.expire(self.key, max(int(reset_at - time.time()), 0) + self.window)
+        pipe.execute()
@@ -0,0 +1,23 @@
+# Django imports
+from django.conf import settings
+
+# Pip imports
+import redis
+
+
+_connection = None
+
+
+def get_redis():
+    """
+    Returns connection to redis configured in settings. Connection is created lazily
+    and shared inside of the process, redis-py keeps the pool of sockets inside it
+
+    :return: (redis.Redis)
+    """
+    global _connection
+
+    if _connection is None:
+        _connection = redis.Redis(host=settings.REDIS_HOST, port=settings.REDIS_PORT)
+
+    return _connection
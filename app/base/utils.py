@@ -1,3 +1,6 @@
+# Stdlib imports
+import hashlib
+
 # Pip imports
 import six
 from rest_framework.fields import ChoiceField
@@ -16,4 +19,63 @@ class ChoiceDisplayField(ChoiceField):
         return {
             'key': self.choice_strings_to_values.get(six.text_type(value), value),
             'display': self.choice_strings_to_display.get(six.text_type(value), value),
-        }
\ No newline at end of file
+        }
+
+def chunks(items, size):
+    """
+    Splits list into lists with length not bigger than size
+
+    :param items: (list)
+    :param size: (int)
+    :return: generator of lists
+    """
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+
+def construct_etag(request, *state):
+    """
+    Builds ETag of the response from values which describe its data in db, e.g. count and max(updated_at),
+    so a matching request is answered with 304 before the response is serialized.
+    Url and Accept header are a part of the tag, as they change the body too
+
+    :param request: request of the view
+    :param state: values of the data state
+    :return: (str) ETag
+    """
+    raw_etag = '|'.join([request.get_full_path(), request.META.get('HTTP_ACCEPT', '')] + [str(value) for value in state])
+    return hashlib.md5(raw_etag.encode('utf-8')).hexdigest()
+
+
+def requested_fields(request, param='fields'):
+    """
+    Parses sparse fieldset from query param, e.g. ?fields=eip_num,eip_title
+
+    :param request: request of the view or None
+    :param param: name of query param
+    :return: set of field names or None if all fields are requested
+    """
+    if request is None:
+        return None
+
+    raw_fields = request.query_params.get(param)
+    if not raw_fields:
+        return None
+
+    return set(field.strip() for field in raw_fields.split(',') if field.strip())
+
+
+class SparseFieldsMixin(object):
+    """
+    Serializer mixin which drops all fields that are not listed in ?fields= query param of the request
+    """
+
+    def __init__(self, *args, **kwargs):
+        super(SparseFieldsMixin, self).__init__(*args, **kwargs)
+
+        fields = requested_fields(self.context.get('request'))
+        if fields is None:
+            return
+
+        for field_name in set(self.fields) - fields:
+            self.fields.pop(field_name)
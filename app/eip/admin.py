@@ -2,9 +2,24 @@
 from django.contrib import admin
 
 # App imports
+from .facets import invalidate_facets
 from .models import EIP
 
 
 @admin.register(EIP)
 class EIPAdmin(admin.ModelAdmin):
     list_display = ('file_name',)
+
+    def get_queryset(self, request):
+        """
+        Markdown content and its rendered HTML are loaded only when they are accessed, e.g. on change form
+        """
+        return super().get_queryset(request).defer(*EIP.BODY_FIELDS)
+
+    def save_model(self, request, obj, form, change):
+        super().save_model(request, obj, form, change)
+        invalidate_facets()
+
+    def delete_model(self, request, obj):
+        super().delete_model(request, obj)
+        invalidate_facets()
@@ -0,0 +1,100 @@
+# Stdlib imports
+import hashlib
+import json
+import logging
+
+# Django imports
+from django.conf import settings
+from django.db.models import Count
+
+# Pip imports
+import redis
+
+# Project imports
+from base.redis_client import get_redis
+
+# App imports
+from .models import EIP
+
+
+logger = logging.getLogger(__name__)
+
+# Facets and choices of their values
+FACETS = (
+    ('eip_status', EIP.PROPOSAL_STATUSES),
+    ('eip_type', EIP.TYPES),
+    ('eip_category', EIP.CATEGORIES),
+)
+
+FACETS_CACHE_PREFIX = 'eip:facets:'
+
+# Version is a part of cache keys, it is increased when EIPs are changed, so all cached facets are dropped at once
+FACETS_VERSION_KEY = FACETS_CACHE_PREFIX + 'version'
+
+
+def count_facets(queryset):
+    """
+    Counts EIPs per status, type and category with one grouped query.
+    Combinations of facet values are grouped in db and summed into every facet here
+
+    :param queryset: EIPs, may be filtered
+    :return: dict {'total': int, facet: [{'key', 'display', 'count'}]}
+    """
+    groups = queryset.order_by().values(*[facet for facet, choices in FACETS]).annotate(count=Count('*'))
+
+    counts = {facet: {} for facet, choices in FACETS}
+    total = 0
+    for group in groups:
+        total += group['count']
+        for facet, choices in FACETS:
+            counts[facet][group[facet]] = counts[facet].get(group[facet], 0) + group['count']
+
+    facets = {'total': total}
+    for facet, choices in FACETS:
+        facets[facet] = [
+            {'key': key, 'display': display, 'count': counts[facet].get(key, 0)}
+            for key, display in choices
+        ]
+
+    return facets
+
+
+def cached_facets(params, compute):
+    """
+    Returns facets for query params from redis or computes and caches them
+
+    :param params: query params of the request, facets are cached per their combination
+    :param compute: function without params which counts facets
+    :return: dict of facets
+    """
+    try:
+        connection = get_redis()
+        version = int(connection.get(FACETS_VERSION_KEY) or 0)
+        raw_key = json.dumps(sorted((key, sorted(params.getlist(key))) for key in params))
+        cache_key = '{}v{}:{}'.format(FACETS_CACHE_PREFIX, version, hashlib.md5(raw_key.encode('utf-8')).hexdigest())
+
+        cached = connection.get(cache_key)
+        if cached:
+            return json.loads(cached.decode('utf-8'))
+    except redis.RedisError as ex:
+        logger.warning("Can't read EIP facets cache, error occurred: '{}'".format(ex))
+        return compute()
+
+    facets = compute()
+
+    try:
+        connection.set(cache_key, json.dumps(facets), ex=settings.EIP_FACETS_CACHE_TIMEOUT)
+    except redis.RedisError as ex:
+        logger.warning("Can't write EIP facets cache, error occurred: '{}'".format(ex))
+
+    return facets
+
+
+def invalidate_facets():
+    """
+    Drops all cached facets, must be called after EIPs are changed
+    """
+    try:
+        get_redis().incr(FACETS_VERSION_KEY)
+    except redis.RedisError as ex:
+        logger.warning("Can't invalidate EIP facets cache, error occurred: '{}'".format(ex))
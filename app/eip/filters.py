@@ -0,0 +1,28 @@
+# Pip imports
+import django_filters
+
+# App imports
+from .models import EIP
+
+
+class EIPFilter(django_filters.FilterSet):
+    """
+    Filters of EIPs, every choice filter accepts several values: ?status=DRAFT&status=LAST_CALL,
+    numbers are filtered by range: ?number_min=20&number_max=1000
+    """
+
+    status = django_filters.MultipleChoiceFilter(field_name='eip_status', choices=EIP.PROPOSAL_STATUSES)
+
+    type = django_filters.MultipleChoiceFilter(field_name='eip_type', choices=EIP.TYPES)
+
+    category = django_filters.MultipleChoiceFilter(field_name='eip_category', choices=EIP.CATEGORIES)
+
+    is_voting_active = django_filters.BooleanFilter(field_name='is_voting_active')
+
+    number_min = django_filters.NumberFilter(field_name='eip_number', lookup_expr='gte')
+
+    number_max = django_filters.NumberFilter(field_name='eip_number', lookup_expr='lte')
+
+    class Meta:
+        model = EIP
+        fields = ['status', 'type', 'category', 'is_voting_active', 'number_min', 'number_max']
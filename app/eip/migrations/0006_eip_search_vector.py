@@ -0,0 +1,35 @@
+# Generated by Django 2.2.24 on 2026-10-18 10:12
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.contrib.postgres.search import SearchVector
+from django.db import migrations
+
+
+def populate_search_vectors(apps, schema_editor):
+    EIP = apps.get_model('eip', 'EIP')
+    EIP.objects.update(search_vector=(
+        SearchVector('eip_title', weight='A') +
+        SearchVector('eip_authors', weight='B') +
+        SearchVector('file_content', weight='C')
+    ))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('eip', '0005_eip_is_voting_active'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='eip',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='eip',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='eip_eip_search__ac0d4c_gin'),
+        ),
+        migrations.RunPython(populate_search_vectors, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 2.2.24 on 2026-10-18 10:12
+
+import django.contrib.postgres.fields.jsonb
+from django.db import migrations, models
+
+from eip.utils import render_eip_markdown
+
+
+def render_stored_eips(apps, schema_editor):
+    EIP = apps.get_model('eip', 'EIP')
+    for eip in EIP.objects.only('id', 'file_content').iterator():
+        eip.file_html, eip.file_toc = render_eip_markdown(eip.file_content)
+        eip.save(update_fields=['file_html', 'file_toc'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('eip', '0006_eip_search_vector'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='eip',
+            name='file_html',
+            field=models.TextField(blank=True, default=''),
+        ),
+        migrations.AddField(
+            model_name='eip',
+            name='file_toc',
+            field=django.contrib.postgres.fields.jsonb.JSONField(blank=True, default=list),
+        ),
+        migrations.RunPython(render_stored_eips, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,55 @@
+# Generated by Django 2.2.24 on 2026-10-18 10:12
+
+import base.fields
+from django.db import migrations, models
+
+
+def compress_file_contents(apps, schema_editor):
+    EIP = apps.get_model('eip', 'EIP')
+    for eip in EIP.objects.only('id', 'file_content').iterator():
+        eip.compressed_file_content = eip.file_content
+        eip.save(update_fields=['compressed_file_content'])
+
+
+def decompress_file_contents(apps, schema_editor):
+    EIP = apps.get_model('eip', 'EIP')
+    for eip in EIP.objects.only('id', 'compressed_file_content').iterator():
+        eip.file_content = eip.compressed_file_content
+        eip.save(update_fields=['file_content'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('eip', '0007_eip_file_html'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='eip',
+            name='compressed_file_content',
+            field=base.fields.CompressedTextField(null=True),
+        ),
+        # Plain column is nullable while it is empty, so the reverse can add it back to the filled table
+        # and set NOT NULL after decompress_file_contents filled it
+        migrations.AlterField(
+            model_name='eip',
+            name='file_content',
+            field=models.TextField(null=True),
+        ),
+        migrations.RunPython(compress_file_contents, decompress_file_contents),
+        migrations.RemoveField(
+            model_name='eip',
+            name='file_content',
+        ),
+        migrations.RenameField(
+            model_name='eip',
+            old_name='compressed_file_content',
+            new_name='file_content',
+        ),
+        migrations.AlterField(
+            model_name='eip',
+            name='file_content',
+            field=base.fields.CompressedTextField(),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 2.2.24 on 2026-10-18 10:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('eip', '0008_eip_compressed_file_content'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='eip',
+            index=models.Index(fields=['eip_status', 'eip_type', 'eip_category', 'is_voting_active'],
+                               name='eip_eip_eip_sta_3e2d63_idx'),
+        ),
+    ]
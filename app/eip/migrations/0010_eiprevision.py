@@ -0,0 +1,36 @@
+# Generated by Django 2.2.24 on 2026-10-18 10:12
+
+import base.fields
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('eip', '0009_eip_facets_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EIPRevision',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('number', models.PositiveIntegerField()),
+                ('file_sha', models.CharField(max_length=100)),
+                ('is_snapshot', models.BooleanField(default=False)),
+                ('snapshot', base.fields.CompressedTextField(blank=True, null=True)),
+                ('delta', base.fields.CompressedTextField(blank=True, null=True)),
+                ('eip', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='revisions', to='eip.EIP')),
+            ],
+            options={
+                'unique_together': {('eip', 'number')},
+            },
+        ),
+        migrations.AddIndex(
+            model_name='eiprevision',
+            index=models.Index(fields=['eip', 'file_sha'], name='eip_eiprevi_eip_id_ae802f_idx'),
+        ),
+    ]
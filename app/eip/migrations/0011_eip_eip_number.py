@@ -0,0 +1,48 @@
+# Generated by Django 2.2.24 on 2026-10-18 10:12
+
+from django.db import migrations, models
+
+
+def populate_eip_numbers(apps, schema_editor):
+    EIP = apps.get_model('eip', 'EIP')
+    eips = list(EIP.objects.only('id', 'eip_num'))
+    for eip in eips:
+        eip.eip_number = int(eip.eip_num) if eip.eip_num and eip.eip_num.isdigit() else None
+
+    EIP.objects.bulk_update(eips, ['eip_number'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('eip', '0010_eiprevision'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='eip',
+            name='eip_number',
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.RunPython(populate_eip_numbers, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='eip',
+            index=models.Index(fields=['eip_number'], name='eip_eip_eip_num_983041_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='eip',
+            index=models.Index(fields=['eip_status', 'eip_number'], name='eip_eip_eip_sta_9e57e5_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='eip',
+            index=models.Index(fields=['eip_type', 'eip_number'], name='eip_eip_eip_typ_ee58a6_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='eip',
+            index=models.Index(fields=['eip_category', 'eip_number'], name='eip_eip_eip_cat_3b6494_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='eip',
+            index=models.Index(fields=['is_voting_active', 'eip_number'], name='eip_eip_is_voti_4517c0_idx'),
+        ),
+    ]
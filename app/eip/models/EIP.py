@@ -1,10 +1,27 @@
 # Django imports
+from django.contrib.postgres.fields import JSONField
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVector
+from django.contrib.postgres.search import SearchVectorField
 from django.db import models
+from django.db import transaction
+from django.db.models import Case
+from django.db.models import Value
+from django.db.models import When
 
 # Project imports
+from base.fields import CompressedTextField
 from base.models import TimeStampedModel
+from base.utils import chunks
 from ethereum_client.models import VotingDetailsLog
 
+# App imports
+from ..utils import render_eip_markdown
+
+
+# Amount of search documents written with one statement
+SEARCH_VECTOR_BATCH_SIZE = 500
+
 
 class EIP(TimeStampedModel):
     """
@@ -135,10 +152,18 @@ class EIP(TimeStampedModel):
 
     file_name           = models.CharField(max_length=255)
     file_download_url   = models.URLField()
-    file_content        = models.TextField()
+    # Stored compressed, decompressed on access
+    file_content        = CompressedTextField()
     file_sha            = models.CharField(max_length=100)
 
+    # Sanitized HTML and table of contents of file_content, rendered once per file_sha in the sync
+    file_html           = models.TextField(blank=True, default='')
+    file_toc            = JSONField(blank=True, default=list)
+
     eip_num         = models.CharField(max_length=10, unique=True)
+
+    # Numeric value of eip_num for ordering and ranges, null when eip_num is not a number
+    eip_number      = models.PositiveIntegerField(null=True, blank=True, editable=False)
     eip_title       = models.CharField(max_length=225)
     eip_status      = models.CharField(max_length=30, choices=PROPOSAL_STATUSES)
     eip_type        = models.CharField(max_length=30, choices=TYPES)
@@ -159,6 +184,28 @@ class EIP(TimeStampedModel):
 
     is_voting_active    = models.BooleanField(default=False)
 
+    # Markdown representations which are heavy and loaded only when requested
+    BODY_FIELDS = ('file_content', 'file_html', 'file_toc')
+
+    # Weighted full text document of title, authors and content, kept in sync by update_search_vectors
+    search_vector       = SearchVectorField(null=True, blank=True, editable=False)
+
+    # Fields of the search document, it is rebuilt only when one of them is saved
+    SEARCH_DOCUMENT_FIELDS = ('eip_title', 'eip_authors', 'file_content')
+
+    class Meta:
+        indexes = [
+            GinIndex(fields=['search_vector']),
+            # Covers grouped counts of facets, filtered by any of these fields
+            models.Index(fields=['eip_status', 'eip_type', 'eip_category', 'is_voting_active']),
+            # Filtered lists ordered by number
+            models.Index(fields=['eip_number']),
+            models.Index(fields=['eip_status', 'eip_number']),
+            models.Index(fields=['eip_type', 'eip_number']),
+            models.Index(fields=['eip_category', 'eip_number']),
+            models.Index(fields=['is_voting_active', 'eip_number']),
+        ]
+
 
     def __str__(self):
         return "{}, {}".format(self.eip_num, self.eip_title)
@@ -169,13 +216,93 @@ class EIP(TimeStampedModel):
         self.file_download_url  = new_eip.file_download_url
         self.file_content       = new_eip.file_content
         self.file_sha           = new_eip.file_sha
+        self.file_html          = new_eip.file_html
+        self.file_toc           = new_eip.file_toc
 
         self.eip_num            = new_eip.eip_num
+        self.eip_number         = new_eip.eip_number
         self.eip_title          = new_eip.eip_title
         self.eip_status         = new_eip.eip_status
         self.eip_type           = new_eip.eip_type
         self.eip_category       = new_eip.eip_category
         self.eip_authors        = new_eip.eip_authors
+        self.eip_created        = new_eip.eip_created
+        self.eip_created_raw    = new_eip.eip_created_raw
+
+        return self
 
+    def render_content(self):
+        """
+        Renders markdown of file_content into file_html and file_toc
+        """
+        self.file_html, self.file_toc = render_eip_markdown(self.file_content)
         return self
 
+    def save(self, *args, **kwargs):
+        """
+        Content changed outside of the sync (e.g. in admin) is recorded as revision too,
+        otherwise deltas of the next revisions would be computed against content which has no revision.
+        Saves which don't write the content (update_fields without it or the content was never accessed)
+        don't read the previous content and don't record revisions
+        """
+        from ..revisions import record_revisions
+
+        self.eip_number = EIP.number_of(self.eip_num)
+
+        update_fields = kwargs.get('update_fields')
+        is_content_saved = (update_fields is None or 'file_content' in update_fields) and self.is_content_accessed()
+        is_document_saved = update_fields is None or bool(set(update_fields) & set(self.SEARCH_DOCUMENT_FIELDS))
+
+        previous = None
+        if is_content_saved and self.pk:
+            previous = EIP.objects.only('file_sha', 'file_content').filter(pk=self.pk).first()
+
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+
+            if is_document_saved:
+                EIP.update_search_vectors([self])
+
+            if not is_content_saved:
+                return
+
+            if previous is None:
+                record_revisions([(self, None, None)])
+            elif previous.file_sha != self.file_sha or previous.file_content != self.file_content:
+                record_revisions([(self, previous.file_sha, previous.file_content)])
+
+    def is_content_accessed(self):
+        """
+        Content loaded from db stays compressed until it is accessed, so not accessed content is not changed
+        """
+        return isinstance(self.__dict__.get('file_content'), str)
+
+    @staticmethod
+    def number_of(eip_num):
+        """
+        :param eip_num: (str) number of EIP from the preamble
+        :return: (int) or None if it is not a number
+        """
+        return int(eip_num) if eip_num and eip_num.isdigit() else None
+
+    @classmethod
+    def update_search_vectors(cls, eips):
+        """
+        Rebuilds search documents of EIPs. Content is stored compressed, so db can't read it,
+        the documents are built from values of given instances. Bulk writes don't call save,
+        so they have to call it after writing
+
+        Documents of many EIPs are written with one statement per batch, EIPs are matched by pk
+
+        :param eips: list of saved EIP with loaded title, authors and content
+        :return:
+        """
+        for batch in chunks(eips, SEARCH_VECTOR_BATCH_SIZE):
+            cls.objects.filter(pk__in=[eip.pk for eip in batch]).update(search_vector=Case(
+                *[When(pk=eip.pk, then=(
+                    SearchVector(Value(eip.eip_title, output_field=models.TextField()), weight='A') +
+                    SearchVector(Value(eip.eip_authors, output_field=models.TextField()), weight='B') +
+                    SearchVector(Value(eip.file_content, output_field=models.TextField()), weight='C')
+                )) for eip in batch],
+                output_field=SearchVectorField()
+            ))
@@ -1 +1,2 @@
-from .EIP import EIP
\ No newline at end of file
+from .EIP import EIP
+from .eip_revision import EIPRevision
\ No newline at end of file
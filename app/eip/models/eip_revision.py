@@ -0,0 +1,58 @@
+# Django imports
+from django.db import models
+
+# Project imports
+from base.fields import CompressedTextField
+from base.models import TimeStampedModel
+
+# App imports
+from .EIP import EIP
+
+
+class EIPRevision(TimeStampedModel):
+    """
+    Version of the content of EIP file, recorded by the sync when the file is changed.
+
+    Revision keeps either the full content (snapshot) or a delta against the previous revision
+    of the same EIP. Snapshots are written periodically, so any version is rebuilt from
+    one snapshot and a bounded amount of deltas
+    """
+
+    eip                 = models.ForeignKey(EIP, related_name='revisions', on_delete=models.CASCADE)
+
+    # Sequence number of the revision inside of the EIP, starts from 1
+    number              = models.PositiveIntegerField()
+
+    file_sha            = models.CharField(max_length=100)
+
+    is_snapshot         = models.BooleanField(default=False)
+
+    # Full content of the file, only for snapshots
+    snapshot            = CompressedTextField(null=True, blank=True)
+
+    # JSON list of operations against the previous revision, only for not snapshots
+    delta               = CompressedTextField(null=True, blank=True)
+
+    class Meta:
+        unique_together = ('eip', 'number')
+        indexes = [
+            models.Index(fields=['eip', 'file_sha']),
+        ]
+
+    def __str__(self):
+        return "EIP: {}, revision: {}, sha: {}".format(self.eip_id, self.number, self.file_sha)
+
+    @classmethod
+    def latest_by_eips(cls, eip_ids):
+        """
+        Loads the latest revision of every EIP with one query
+
+        :param eip_ids: list of EIP ids
+        :return: dict {eip_id: EIPRevision}
+        """
+        revisions = cls.objects.filter(eip_id__in=eip_ids)\
+            .defer('snapshot', 'delta')\
+            .order_by('eip_id', '-number')\
+            .distinct('eip_id')
+
+        return {revision.eip_id: revision for revision in revisions}
@@ -0,0 +1,121 @@
+# Stdlib imports
+import difflib
+import json
+
+# Django imports
+from django.conf import settings
+
+# Project imports
+from base.utils import chunks
+
+# App imports
+from .models import EIPRevision
+
+
+# Amount of revisions written to db with one statement
+BULK_BATCH_SIZE = 500
+
+
+def compute_delta(old_content, new_content):
+    """
+    Delta is a list of operations applied to lines of the old content:
+    [start, end] copies old lines [start:end], a string inserts new text
+
+    :param old_content: (str)
+    :param new_content: (str)
+    :return: list of operations
+    """
+    old_lines = old_content.splitlines(keepends=True)
+    new_lines = new_content.splitlines(keepends=True)
+
+    delta = []
+    matcher = difflib.SequenceMatcher(None, old_lines, new_lines, autojunk=False)
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == 'equal':
+            delta.append([i1, i2])
+        elif j2 > j1:
+            delta.append(''.join(new_lines[j1:j2]))
+
+    return delta
+
+
+def apply_delta(old_content, delta):
+    old_lines = old_content.splitlines(keepends=True)
+    return ''.join(
+        ''.join(old_lines[operation[0]:operation[1]]) if isinstance(operation, list) else operation
+        for operation in delta
+    )
+
+
+def record_revisions(changes):
+    """
+    Writes revisions of changed EIPs by batches. The latest revisions of all EIPs are loaded with one query.
+    EIPs stored before revisions were recorded start their history with the previous content
+
+    :param changes: list of (eip, previous_file_sha, previous_file_content), previous values are None for new EIPs
+    :return:
+    """
+    if len(changes) == 0:
+        return
+
+    interval = settings.EIP_REVISION_SNAPSHOT_INTERVAL
+    latest_revisions = EIPRevision.latest_by_eips([eip.id for eip, previous_sha, previous_content in changes])
+
+    revisions = []
+    for eip, previous_sha, previous_content in changes:
+        latest_revision = latest_revisions.get(eip.id)
+        number = latest_revision.number if latest_revision else 0
+
+        if latest_revision is None and previous_content is not None:
+            number += 1
+            revisions.append(EIPRevision(eip=eip, number=number, file_sha=previous_sha,
+                                         is_snapshot=True, snapshot=previous_content))
+
+        number += 1
+        if previous_content is None or (number - 1) % interval == 0:
+            revisions.append(EIPRevision(eip=eip, number=number, file_sha=eip.file_sha,
+                                         is_snapshot=True, snapshot=eip.file_content))
+        else:
+            revisions.append(EIPRevision(eip=eip, number=number, file_sha=eip.file_sha,
+                                         delta=json.dumps(compute_delta(previous_content, eip.file_content))))
+
+    for batch in chunks(revisions, BULK_BATCH_SIZE):
+        EIPRevision.objects.bulk_create(batch)
+
+
+def rebuild_content(revision):
+    """
+    Rebuilds content of the revision from the closest snapshot before it and deltas after the snapshot
+
+    :param revision: (EIPRevision)
+    :return: (str) content of EIP file
+    """
+    if revision.is_snapshot:
+        return revision.snapshot
+
+    snapshot = EIPRevision.objects.filter(eip_id=revision.eip_id, number__lt=revision.number, is_snapshot=True)\
+        .order_by('-number')\
+        .first()
+
+    deltas = EIPRevision.objects.filter(eip_id=revision.eip_id,
+                                        number__gt=snapshot.number,
+                                        number__lte=revision.number)\
+        .order_by('number')\
+        .only('id', 'delta')
+
+    content = snapshot.snapshot
+    for delta_revision in deltas:
+        content = apply_delta(content, json.loads(delta_revision.delta))
+
+    return content
+
+
+def diff_contents(from_revision, to_revision):
+    """
+    :return: (str) unified diff between contents of revisions
+    """
+    from_lines = rebuild_content(from_revision).splitlines(keepends=True)
+    to_lines = rebuild_content(to_revision).splitlines(keepends=True)
+
+    return ''.join(difflib.unified_diff(from_lines, to_lines,
+                                        fromfile=from_revision.file_sha, tofile=to_revision.file_sha))
@@ -1 +1,4 @@
-from .eip_serializer import EIPSerializer
\ No newline at end of file
+from .eip_serializer import EIPSerializer
+from .eips_serializer import EIPsSerializer
+from .eip_html_serializer import EIPHtmlSerializer
+from .eip_revision_serializer import EIPRevisionSerializer
\ No newline at end of file
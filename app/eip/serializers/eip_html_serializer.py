@@ -0,0 +1,11 @@
+# App imports
+from .eip_serializer import EIPSerializer
+
+
+class EIPHtmlSerializer(EIPSerializer):
+    """
+    Representation of EIP with pre-rendered HTML and table of contents instead of markdown content of the file
+    """
+
+    class Meta(EIPSerializer.Meta):
+        exclude = ('search_vector', 'file_content')
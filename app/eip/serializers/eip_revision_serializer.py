@@ -0,0 +1,12 @@
+# Pip imports
+from rest_framework import serializers
+
+# App imports
+from ..models import EIPRevision
+
+
+class EIPRevisionSerializer(serializers.ModelSerializer):
+
+    class Meta:
+        model = EIPRevision
+        fields = ['number', 'file_sha', 'is_snapshot', 'created_at']
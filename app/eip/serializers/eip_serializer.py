@@ -1,8 +1,13 @@
+# Django imports
+from django.db import models
+
 # Pip imports
 from rest_framework import serializers
 
 # Project imports
+from base.fields import CompressedTextField
 from base.utils import ChoiceDisplayField
+from base.utils import SparseFieldsMixin
 from ethereum_client.serializers import VotingDetailsLogSerializer
 from ethereum_client.models import VotingDetailsLog
 
@@ -10,7 +15,38 @@ from ethereum_client.models import VotingDetailsLog
 from ..models import EIP
 
 
-class EIPSerializer(serializers.ModelSerializer):
+def proposal_id_of(eip):
+    """
+    Voting proposal id is the number of EIP
+    """
+    return EIP.number_of(eip.eip_num)
+
+
+class EIPListSerializer(serializers.ListSerializer):
+    """
+    Loads voting details of all EIPs in the list with one query
+    """
+
+    def to_representation(self, data):
+        iterable = data.all() if isinstance(data, models.Manager) else data
+        eips = list(iterable)
+
+        if 'voting_details' in self.child.fields:
+            proposal_ids = [proposal_id_of(eip) for eip in eips]
+            self.context['voting_details'] = VotingDetailsLog.latest_by_proposals(
+                [proposal_id for proposal_id in proposal_ids if proposal_id is not None]
+            )
+
+        return super().to_representation(eips)
+
+
+class EIPSerializer(SparseFieldsMixin, serializers.ModelSerializer):
+
+    # Compressed content of the file is represented as plain text
+    serializer_field_mapping = {
+        **serializers.ModelSerializer.serializer_field_mapping,
+        CompressedTextField: serializers.CharField,
+    }
 
     eip_status = ChoiceDisplayField(choices=EIP.PROPOSAL_STATUSES)
 
@@ -22,7 +58,8 @@ class EIPSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = EIP
-        fields = "__all__"
+        exclude = ('search_vector', 'file_html', 'file_toc')
+        list_serializer_class = EIPListSerializer
 
 
     """
@@ -30,11 +67,17 @@ class EIPSerializer(serializers.ModelSerializer):
     """
 
     def get_voting_details(self, obj):
-        try:
-            serializer = VotingDetailsLogSerializer(
-                instance=VotingDetailsLog.objects.get(proposal_id=obj.eip_num),
-                many = False
-            )
-            return serializer.data
-        except VotingDetailsLog.DoesNotExist:
+        proposal_id = proposal_id_of(obj)
+        if proposal_id is None:
             return None
+
+        # Voting details are preloaded for lists, single EIP loads only own details
+        voting_details = self.context.get('voting_details')
+        if voting_details is None:
+            voting_details = VotingDetailsLog.latest_by_proposals([proposal_id])
+
+        log = voting_details.get(proposal_id)
+        if log is None:
+            return None
+
+        return VotingDetailsLogSerializer(instance=log, many=False).data
@@ -0,0 +1,12 @@
+# App imports
+from ..models import EIP
+from .eip_serializer import EIPSerializer
+
+
+class EIPsSerializer(EIPSerializer):
+    """
+    List representation of EIP, without markdown content of the file
+    """
+
+    class Meta(EIPSerializer.Meta):
+        exclude = ('search_vector',) + EIP.BODY_FIELDS
@@ -2,47 +2,179 @@
 import logging
 
 # Django imports
+from django.conf import settings
 from django.db import transaction
+from django.utils import timezone
+from django.utils.module_loading import import_string
 
 # Pip imports
 from celery import task
 
+# Project imports
+from base.utils import chunks
+
 # App imports
-from github_client.services import GitHubEIP
+from .facets import invalidate_facets
 from .models import EIP
+from .revisions import record_revisions
 
 
 logger = logging.getLogger(__name__)
 
+# Amount of EIPs written to db with one statement
+BULK_BATCH_SIZE = 500
+
+# Fields which are changed by EIP.update_with_eip
+UPDATE_FIELDS = [
+    'file_name', 'file_download_url', 'file_content', 'file_sha', 'file_html', 'file_toc',
+    'eip_num', 'eip_number', 'eip_title', 'eip_status', 'eip_type', 'eip_category', 'eip_authors', 'eip_created',
+    'eip_created_raw', 'updated_at',
+]
+
 
 @task()
 def fetch_eips_from_official_repo():
     """
     All EIPs stored in official repo: https://github.com/ethereum/EIPs/tree/master/EIPS
 
+    The git tree of the EIPS folder is compared with (file_name, file_sha) pairs stored in our db,
+    so only new and changed EIPs are loaded from the repo and rendered into HTML.
+    Loaded EIPs are written with batched statements.
+    The repo is read with the source configured in settings.EIPS_SOURCE
+
     :return:
     """
-    gh = GitHubEIP()
+    gh = import_string(settings.EIPS_SOURCE)()
     eips = gh.eips_list()
 
-    for eip in eips:
+    # All stored files with their blob sha in one query
+    stored_shas = dict(EIP.objects.values_list('file_name', 'file_sha'))
+
+    # EIPs which are not changed since the last sync are skipped
+    changed_eips = [eip for eip in eips if stored_shas.get(eip.name) != eip.sha]
+
+    # Contents of changed EIPs are loaded in parallel
+    gh.prefetch(changed_eips)
+
+    new_eips = []
+    updated_eips = []
+
+    for eip in changed_eips:
         file_name = eip.name
-        file_sha = eip.sha
+
+        try:
+            # Markdown is rendered only here, when the content is changed
+            loaded_eip = gh.load_eip(eip).render_content()
+        except Exception as ex:
+            logger.error("Can't parse EIP with file name: '{}', error occurred: '{}'".format(file_name, ex))
+            continue
 
         # Check weather this EIP exists in out db
-        if not EIP.objects.filter(file_name=file_name).exists():
+        if file_name not in stored_shas:
+            new_eips.append(loaded_eip)
+        else:
+            updated_eips.append(loaded_eip)
+
+    created_eips = create_eips(new_eips)
+    changes = update_eips(updated_eips)
+
+    if created_eips or changes:
+        invalidate_facets()
+
+
+def create_eips(eips):
+    """
+    Inserts new EIPs by batches. If db rejects the batch (e.g. duplicated eip_num)
+    EIPs of this batch are saved one by one, so only broken files are skipped.
+    Revisions and search documents are written in the transaction of the batch
+
+    :param eips: list of not saved EIP
+    :return: list of saved EIP
+    """
+    created_eips = []
+
+    for batch in chunks(eips, BULK_BATCH_SIZE):
+        try:
+            with transaction.atomic():
+                EIP.objects.bulk_create(batch)
+                store_written_eips([(eip, None, None) for eip in batch])
+            created_eips.extend(batch)
+            continue
+        except Exception as ex:
+            logger.warning("Can't insert batch of EIPs, saving them one by one. Error occurred: '{}'".format(ex))
+
+        for eip in batch:
             try:
+                # save records the revision and the search document itself
                 with transaction.atomic():
-                    gh.load_eip(eip).save()
+                    eip.save()
+                created_eips.append(eip)
             except Exception as ex:
-                logger.error("Can't parse EIP with file name: '{}', error occurred: '{}'".format(file_name, ex))
+                logger.error("Can't save EIP with file name: '{}', error occurred: '{}'".format(eip.file_name, ex))
 
-        # check weather EIP was updated
-        elif not EIP.objects.filter(file_name=file_name, file_sha=file_sha).exists():
-            eip_to_update = EIP.objects.filter(file_name=file_name).first()
-            eip_to_update.update_with_eip(gh.load_eip(eip)).save()
+    return created_eips
 
 
+def update_eips(eips):
+    """
+    Updates stored EIPs with loaded ones by batches. Stored EIPs are found by file name with one query.
+    If db rejects the batch EIPs of this batch are saved one by one, so only broken files are skipped.
+    Revisions and search documents are written in the transaction of the batch, so file_sha is never stored
+    without the revision of its content
 
+    :param eips: list of not saved EIP
+    :return: list of (updated EIP, previous file_sha, previous file_content)
+    """
+    if len(eips) == 0:
+        return []
 
+    stored_eips = {
+        stored_eip.file_name: stored_eip
+        for stored_eip in EIP.objects.filter(file_name__in=[eip.file_name for eip in eips])
+    }
+    now = timezone.now()
 
+    eips_to_update = []
+    previous_states = {}
+    for eip in eips:
+        stored_eip = stored_eips[eip.file_name]
+        previous_states[eip.file_name] = (stored_eip.file_sha, stored_eip.file_content)
+
+        eip_to_update = stored_eip.update_with_eip(eip)
+        eip_to_update.updated_at = now
+        eips_to_update.append(eip_to_update)
+
+    updated_eips = []
+
+    for batch in chunks(eips_to_update, BULK_BATCH_SIZE):
+        try:
+            with transaction.atomic():
+                EIP.objects.bulk_update(batch, UPDATE_FIELDS)
+                store_written_eips([(eip,) + previous_states[eip.file_name] for eip in batch])
+            updated_eips.extend(batch)
+            continue
+        except Exception as ex:
+            logger.warning("Can't update batch of EIPs, saving them one by one. Error occurred: '{}'".format(ex))
+
+        for eip in batch:
+            try:
+                # save records the revision and the search document itself
+                with transaction.atomic():
+                    eip.save()
+                updated_eips.append(eip)
+            except Exception as ex:
+                logger.error("Can't update EIP with file name: '{}', error occurred: '{}'".format(eip.file_name, ex))
+
+    return [(eip,) + previous_states[eip.file_name] for eip in updated_eips]
+
+
+def store_written_eips(changes):
+    """
+    Records revisions of EIPs written by bulk statements and rebuilds their search documents,
+    bulk writes don't call save. Must be called in the transaction of the write
+
+    :param changes: list of (written EIP, previous file_sha, previous file_content), previous values are None for new EIPs
+    :return:
+    """
+    record_revisions(changes)
+    EIP.update_search_vectors([eip for eip, previous_sha, previous_content in changes])
@@ -1,5 +1,18 @@
 # Stdlib imports
+import io
+import json
+import os
+import shutil
+import subprocess
+import tempfile
+import zlib
 from datetime import date
+from unittest import mock
+
+# Django imports
+from django.conf import settings
+from django.core.management import call_command
+from django.test import override_settings
 
 # Pip imports
 from rest_framework.test import APITestCase
@@ -11,9 +24,22 @@ from ethereum_client.models import VotingDetailsLog
 
 # App imports
 from github_client.services import GitHubEIP
+from github_client.git_command import parse_ls_tree
+from github_client.services import GitMirrorEIP
+from github_client.services.github_session import GitHubSession
+from github_client.utils import parse_created_date
 from github_client.utils import parse_eip_details
+from github_client.utils import parse_eip_preamble
+from github_client.utils import parse_eip_details_cached
+from github_client.utils import PARSE_CACHE_PREFIX
+from base.redis_client import get_redis
+from .facets import FACETS_VERSION_KEY
 from .models import EIP
+from .models import EIPRevision
+from .revisions import rebuild_content
 from .tasks import fetch_eips_from_official_repo
+from .tasks import create_eips
+from .tasks import update_eips
 
 
 class EIPsUnitTestCase(APITestCase):
@@ -68,6 +94,13 @@ class EIPsUnitTestCase(APITestCase):
 
         self.assertIsNotNone(content_file)
 
+    def test_should_raise_if_eips_tree_is_truncated(self):
+        truncated_tree = {'tree': [{'path': 'eip-1.md', 'type': 'blob', 'sha': 'sha-1'}], 'truncated': True}
+
+        with mock.patch.object(GitHubSession, 'get_json', return_value=truncated_tree):
+            with self.assertRaises(ValueError):
+                self.gh.eips_list()
+
     def test_should_parse_eip_details(self):
         content = "--- \n" \
                   "eip: 1 \n" \
@@ -160,9 +193,475 @@ class EIPsUnitTestCase(APITestCase):
 
         self.assertGreater(EIP.objects.count(), 0)
 
+    def test_should_not_reload_unchanged_eips(self):
+        fetch_eips_from_official_repo()
+        updated_at = dict(EIP.objects.values_list('file_name', 'updated_at'))
+
+        # Second sync compares blob shas and must skip all files
+        fetch_eips_from_official_repo()
+
+        self.assertEqual(updated_at, dict(EIP.objects.values_list('file_name', 'updated_at')))
+
+
+class EIPParserRegressionTestCase(APITestCase):
+    """
+    Parses vendored snapshot of EIP files and compares results with expected.json.
+    The snapshot is reduced: 16 EIPs picked to cover the variants of the preamble, their bodies are trimmed.
+    It checks the known variants, the whole official corpus is checked by EIPParserMirrorRegressionTestCase
+    """
+
+    corpus_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'github_client', 'tests_data', 'eips')
+
+    def setUp(self):
+        with open(os.path.join(self.corpus_path, 'expected.json')) as f:
+            self.expected = json.load(f)
+
+    def read_eip_file(self, file_name):
+        with open(os.path.join(self.corpus_path, file_name), encoding='utf-8') as f:
+            return f.read()
+
+    def test_should_parse_corpus_as_expected(self):
+        for file_name, expected in self.expected.items():
+            content = self.read_eip_file(file_name)
+            eip, title, status, eip_type, category, authors, created_raw, created = parse_eip_details(content)
+            preamble = parse_eip_preamble(content)
+
+            with self.subTest(file_name=file_name):
+                self.assertEqual(eip, expected['eip'])
+                self.assertEqual(title, expected['title'])
+                self.assertEqual(status, expected['status'])
+                self.assertEqual(eip_type, expected['type'])
+                self.assertEqual(category, expected['category'])
+                self.assertEqual(authors, expected['authors'])
+                self.assertEqual(created_raw, expected['created_raw'])
+                self.assertEqual(created.isoformat() if created else None, expected['created'])
+                self.assertEqual(preamble.get('requires', []), expected['requires'])
+                self.assertEqual(preamble.get('replaces', []), expected['replaces'])
+
+    def test_should_not_mark_final_eip_as_replaced(self):
+        eip, title, status, eip_type, category, authors, created_raw, created = \
+            parse_eip_details(self.read_eip_file('eip-20.md'))
+
+        self.assertEqual(status, EIP.FINAL)
+
+    def test_should_parse_multi_line_value(self):
+        preamble = parse_eip_preamble(self.read_eip_file('eip-721.md'))
+
+        self.assertTrue(preamble['author'].endswith("Jacob Evans <jacob@dekz.net>, "
+                                                    "Nastassia Sachs <nastassia.sachs@protonmail.com>"))
+
+    def test_should_raise_if_preamble_not_found(self):
+        with self.assertRaises(ValueError):
+            parse_eip_details("## EIP without preamble")
+
+    def test_should_reuse_cached_details_of_the_same_blob(self):
+        file_sha = 'fixture-sha-eip-20'
+        get_redis().delete(PARSE_CACHE_PREFIX + file_sha)
+
+        details = parse_eip_details_cached(file_sha, self.read_eip_file('eip-20.md'))
+
+        # The same sha means the same content, so the content is not parsed again
+        self.assertEqual(parse_eip_details_cached(file_sha, self.read_eip_file('eip-721.md')), details)
+        get_redis().delete(PARSE_CACHE_PREFIX + file_sha)
+
+    def test_should_run_parser_benchmark(self):
+        out = io.StringIO()
+
+        call_command('benchmark_eip_parser', path=self.corpus_path, repeat=1, stdout=out)
+
+        self.assertIn("Files: {}".format(len(self.expected)), out.getvalue())
+
+
+def parse_eip_details_legacy(content):
+    """
+    Line by line parser which was replaced by parse_eip_preamble, kept as is to compare results of both
+    """
+    is_start_found = False
+    is_finish_found = False
+    eip_type = EIP.OTHER
+    status = EIP.OTHER
+    eip = category = title = authors = created = None
+
+    buff = io.StringIO(content)
+
+    while buff.readable() and not is_finish_found:
+        line = buff.readline()
+        line_lower = line.lower()
+        line = line.replace(' \n', '')
+        line = line.replace('\n', '')
+
+        if line == '' or not line:
+            raise Exception("Not found variables but the end of the content was reached")
+
+        if not is_start_found and '---' in line:
+            is_start_found = True
+            continue
+
+        if is_start_found and '---' in line:
+            is_finish_found = True
+
+        if "eip: " in line_lower:
+            eip = line.replace('eip: ', '')
+
+        if "title: " in line_lower:
+            title = line.replace('title: ', '')
+
+        if "status: " in line_lower:
+            if 'draft' in line_lower:
+                status = EIP.DRAFT
+            elif 'active' in line_lower:
+                status = EIP.ACTIVE
+            elif 'last call' in line_lower:
+                status = EIP.LAST_CALL
+            elif 'replaced' or 'superseded' in line_lower:
+                status = EIP.REPLACED
+            elif 'accepted' in line_lower:
+                status = EIP.ACCEPTED
+            elif 'final' in line_lower:
+                status = EIP.FINAL
+            elif 'deferred' in line_lower:
+                status = EIP.DEFERRED
+
+        if "type: " in line_lower:
+            if 'standards track' in line_lower:
+                eip_type = EIP.STANDARDS_TRACK
+            elif 'informational' in line_lower:
+                eip_type = EIP.INFORMATIONAL
+            elif 'meta' in line_lower:
+                eip_type = EIP.META
+
+        if "category: " in line_lower:
+            if 'core' in line:
+                category = EIP.CORE
+            elif 'networking' in line_lower:
+                category = EIP.NETWORKING
+            elif 'interface' in line_lower:
+                category = EIP.INTERFACE
+            elif 'erc' in line_lower:
+                category = EIP.ERC
+
+        if "author: " in line_lower:
+            authors = line.replace('author: ', '')
+
+        if "authors: " in line_lower:
+            authors = line.replace('authors: ', '')
+
+        if "created: " in line_lower:
+            created_raw = line.replace('created: ', '')
+            created = parse_created_date(created_raw)
+
+    return eip, title, status, eip_type, category, authors, created_raw, created
+
+
+class EIPParserMirrorRegressionTestCase(APITestCase):
+    """
+    Parses every EIP file of the local mirror (settings.EIPS_MIRROR_PATH) with the legacy and the new parser
+    and compares results. Differences are allowed only for the misparses fixed by the new parser:
+    - the legacy parser maps every status after 'last call' to REPLACED
+    - it doesn't recognize 'Core' category (case sensitive match)
+    - it reads only the first line of multi-line values and keeps quotes
+    - it raises on blank lines in the preamble and on missing 'created', such files are not compared
+
+    The mirror is read as it is, without fetch, the test is skipped if it is not cloned
+    (e.g. by running manage.py benchmark_eip_parser)
+    """
+
+    def setUp(self):
+        if not os.path.isdir(settings.EIPS_MIRROR_PATH):
+            self.skipTest("EIPs mirror is not cloned to '{}'".format(settings.EIPS_MIRROR_PATH))
+
+        mirror = GitMirrorEIP()
+        output = mirror.git('ls-tree', '-z', '{}:{}'.format(mirror.branch, mirror.eips_folder))
+        eip_files = [mirror.construct_eip_file(path, sha) for path, sha in parse_ls_tree(output)
+                     if path.endswith('.md')]
+        mirror.prefetch(eip_files)
+
+        self.contents = [(eip_file.path, mirror.blobs[eip_file.sha])
+                         for eip_file in eip_files if eip_file.sha in mirror.blobs]
+
+    def test_should_parse_mirror_as_legacy_parser(self):
+        self.assertGreater(len(self.contents), 0)
+
+        differences = []
+        for file_path, content in self.contents:
+            try:
+                legacy = parse_eip_details_legacy(content)
+            except Exception:
+                continue
+
+            differences += ['{}: {}'.format(file_path, difference)
+                            for difference in self.compare_details(legacy, parse_eip_details(content))]
+
+        self.assertEqual(differences, [])
+
+
+    """
+    Utils / Helpers
+    """
+
+    def compare_details(self, legacy, new):
+        """
+        :return: list of descriptions of differences which are not known fixes of the legacy parser
+        """
+        eip, title, status, eip_type, category, authors, created_raw, created = new
+        (legacy_eip, legacy_title, legacy_status, legacy_eip_type, legacy_category, legacy_authors,
+         legacy_created_raw, legacy_created) = legacy
+
+        differences = []
+
+        for name, value, legacy_value in (('eip', eip, legacy_eip),
+                                          ('type', eip_type, legacy_eip_type),
+                                          ('created', created, legacy_created)):
+            if value != legacy_value:
+                differences.append('{} {!r} != {!r}'.format(name, value, legacy_value))
+
+        if (created_raw or '') != (legacy_created_raw or '').strip():
+            differences.append('created_raw {!r} != {!r}'.format(created_raw, legacy_created_raw))
+
+        # Multi-line values are joined and quotes are removed by the new parser
+        for name, value, legacy_value in (('title', title, legacy_title), ('authors', authors, legacy_authors)):
+            if not (value or '').startswith((legacy_value or '').strip().strip('"\'')):
+                differences.append('{} {!r} != {!r}'.format(name, value, legacy_value))
+
+        if legacy_status == EIP.REPLACED:
+            if status in (EIP.DRAFT, EIP.ACTIVE, EIP.LAST_CALL):
+                differences.append('status {!r} != {!r}'.format(status, legacy_status))
+        elif status != legacy_status:
+            differences.append('status {!r} != {!r}'.format(status, legacy_status))
+
+        if category != legacy_category and not (legacy_category is None and category == EIP.CORE):
+            differences.append('category {!r} != {!r}'.format(category, legacy_category))
+
+        return differences
+
+
+class GitMirrorEIPTestCase(APITestCase):
+    """
+    Runs offline against local fixture repository
+    """
+
+    eip_content = "---\n" \
+                  "eip: 1\n" \
+                  "title: EIP Purpose and Guidelines\n" \
+                  "status: Active\n" \
+                  "type: Meta\n" \
+                  "author: Martin Becze <mb@ethereum.org>, Hudson Jameson <hudson@ethereum.org>, and others\n" \
+                  "created: 2015-10-27\n" \
+                  "---\n" \
+                  "## What is an EIP?\n"
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.fixture_repo = os.path.join(self.tmp_dir, 'EIPs')
+        os.makedirs(os.path.join(self.fixture_repo, 'EIPS'))
+
+        self.git('init')
+        self.git('symbolic-ref', 'HEAD', 'refs/heads/master')
+        self.commit_file('EIPS/eip-1.md', self.eip_content)
+
+        self.gh = GitMirrorEIP(repo_url=self.fixture_repo, mirror_path=os.path.join(self.tmp_dir, 'EIPs.git'))
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def git(self, *args):
+        return subprocess.run(['git', '-c', 'user.name=Test', '-c', 'user.email=test@example.com'] + list(args),
+                              cwd=self.fixture_repo, stdout=subprocess.PIPE, check=True).stdout
+
+    def commit_file(self, path, content):
+        with open(os.path.join(self.fixture_repo, path), 'w') as f:
+            f.write(content)
+        self.git('add', path)
+        self.git('commit', '-m', 'Update {}'.format(path))
+
+    def test_should_list_eips_of_fixture_repo(self):
+        eips_list = self.gh.eips_list()
+
+        self.assertEqual(len(eips_list), 1)
+        self.assertEqual(eips_list[0].name, 'eip-1.md')
+        self.assertEqual(eips_list[0].sha, self.git('rev-parse', 'HEAD:EIPS/eip-1.md').decode('utf-8').strip())
+
+    def test_should_skip_eip_files_of_subfolders(self):
+        os.makedirs(os.path.join(self.fixture_repo, 'EIPS', 'drafts'))
+        self.commit_file('EIPS/drafts/eip-1.md', self.eip_content.replace('status: Active', 'status: Draft'))
+
+        eips_list = self.gh.eips_list()
+
+        self.assertEqual([eip_file.path for eip_file in eips_list], ['EIPS/eip-1.md'])
+        self.assertEqual(eips_list[0].sha, self.git('rev-parse', 'HEAD:EIPS/eip-1.md').decode('utf-8').strip())
+
+    def test_should_load_eip_from_mirror(self):
+        eip = self.gh.load_eip(self.gh.eips_list()[0])
+
+        self.assertEqual(eip.eip_num, "1")
+        self.assertEqual(eip.eip_status, EIP.ACTIVE)
+        self.assertEqual(eip.eip_type, EIP.META)
+        self.assertEqual(eip.file_content, self.eip_content)
+
+    def test_should_prefetch_eips_from_mirror(self):
+        self.commit_file('EIPS/eip-2.md', self.eip_content.replace('eip: 1', 'eip: 2'))
+        eips_list = self.gh.eips_list()
+
+        self.gh.prefetch(eips_list)
+
+        self.assertEqual(len(self.gh.blobs), 2)
+        self.assertEqual(self.gh.load_eip(eips_list[1]).eip_num, "2")
+        self.assertEqual(len(self.gh.blobs), 1)
+
+    def test_should_fetch_new_commits_into_mirror(self):
+        self.assertEqual(len(self.gh.eips_list()), 1)
+
+        self.commit_file('EIPS/eip-2.md', self.eip_content.replace('eip: 1', 'eip: 2'))
+
+        self.assertEqual(len(self.gh.eips_list()), 2)
+
+
+class EIPsPersistenceTestCase(APITestCase):
+
+    def construct_eip(self, eip_num, file_name, file_sha):
+        return EIP(eip_num=eip_num,
+                   eip_title='Title of EIP {}'.format(eip_num),
+                   eip_status=EIP.DRAFT,
+                   eip_type=EIP.META,
+                   eip_authors='Authors here',
+                   file_name=file_name,
+                   file_download_url='https://google.com.ua/',
+                   file_content='Here markdown text from md file',
+                   file_sha=file_sha)
+
+    def test_should_create_eips_in_bulk(self):
+        eips = [self.construct_eip(str(num), 'eip-{}.md'.format(num), 'sha{}'.format(num)) for num in range(1, 20)]
+
+        create_eips(eips)
+
+        self.assertEqual(EIP.objects.count(), 19)
+
+    def test_should_skip_only_broken_eip_of_batch(self):
+        eips = [
+            self.construct_eip('1', 'eip-1.md', 'sha1'),
+            self.construct_eip('1', 'eip-1-copy.md', 'sha1-copy'),
+            self.construct_eip('2', 'eip-2.md', 'sha2'),
+        ]
+
+        create_eips(eips)
+
+        self.assertEqual(EIP.objects.count(), 2)
+        self.assertFalse(EIP.objects.filter(file_name='eip-1-copy.md').exists())
+
+    def test_should_update_eips_in_bulk(self):
+        create_eips([self.construct_eip('1', 'eip-1.md', 'sha1'), self.construct_eip('2', 'eip-2.md', 'sha2')])
+
+        updated_eip = self.construct_eip('2', 'eip-2.md', 'sha2-updated')
+        updated_eip.eip_status = EIP.FINAL
+        update_eips([updated_eip])
+
+        eip = EIP.objects.get(file_name='eip-2.md')
+        self.assertEqual(eip.file_sha, 'sha2-updated')
+        self.assertEqual(eip.eip_status, EIP.FINAL)
+        self.assertEqual(EIP.objects.get(file_name='eip-1.md').file_sha, 'sha1')
+
+    @override_settings(EIP_REVISION_SNAPSHOT_INTERVAL=3)
+    def test_should_rebuild_every_revision_of_eip(self):
+        create_eips([self.construct_eip('1', 'eip-1.md', 'sha0')])
+
+        contents = ['Here markdown text from md file']
+        for version in range(1, 6):
+            updated_eip = self.construct_eip('1', 'eip-1.md', 'sha{}'.format(version))
+            updated_eip.file_content = contents[-1] + '\nline {}'.format(version)
+            contents.append(updated_eip.file_content)
+
+            update_eips([updated_eip])
+
+        revisions = list(EIPRevision.objects.order_by('number'))
+        self.assertEqual([revision.is_snapshot for revision in revisions], [True, False, False, True, False, False])
+
+        for revision, content in zip(revisions, contents):
+            self.assertEqual(rebuild_content(revision), content)
+
+    def test_should_start_history_of_stored_eip_from_previous_content(self):
+        create_eips([self.construct_eip('1', 'eip-1.md', 'sha1')])
+
+        updated_eip = self.construct_eip('1', 'eip-1.md', 'sha2')
+        updated_eip.file_content = 'Changed markdown'
+        update_eips([updated_eip])
+
+        url = reverse("eip:eip_diff", kwargs={'eip_num': '1'}) + '?from=sha1&to=sha2'
+        response = self.client.get(url, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn('-Here markdown text from md file', response.data['diff'])
+        self.assertIn('+Changed markdown', response.data['diff'])
+
+        url = reverse("eip:eip_revision", kwargs={'eip_num': '1', 'file_sha': 'sha1'})
+        response = self.client.get(url, format='json')
+        self.assertEqual(response.data['file_content'], 'Here markdown text from md file')
+
+        url = reverse("eip:eip_revisions", kwargs={'eip_num': '1'})
+        response = self.client.get(url, format='json')
+        self.assertEqual([revision['file_sha'] for revision in response.data], ['sha2', 'sha1'])
+
+    def test_should_record_revision_of_content_changed_outside_of_sync(self):
+        create_eips([self.construct_eip('1', 'eip-1.md', 'sha1')])
+
+        eip = EIP.objects.get(file_name='eip-1.md')
+        eip.file_content = 'Edited markdown'
+        eip.save()
+
+        updated_eip = self.construct_eip('1', 'eip-1.md', 'sha2')
+        updated_eip.file_content = 'Edited markdown\nSynced line'
+        update_eips([updated_eip])
+
+        revisions = list(EIPRevision.objects.filter(eip=eip).order_by('number'))
+        self.assertEqual(len(revisions), 3)
+        self.assertEqual(rebuild_content(revisions[1]), 'Edited markdown')
+        self.assertEqual(rebuild_content(revisions[2]), 'Edited markdown\nSynced line')
+
+    def test_should_not_record_revision_when_content_is_not_saved(self):
+        create_eips([self.construct_eip('1', 'eip-1.md', 'sha1')])
+
+        # Content is not accessed, so it is not changed
+        eip = EIP.objects.get(file_name='eip-1.md')
+        eip.eip_status = EIP.FINAL
+        eip.save()
+
+        eip.file_content = 'Edited markdown'
+        eip.save(update_fields=['eip_status'])
+
+        self.assertEqual(EIPRevision.objects.filter(eip=eip).count(), 1)
+        self.assertEqual(EIP.objects.get(file_name='eip-1.md').file_content, 'Here markdown text from md file')
+
+    def test_should_store_content_compressed(self):
+        create_eips([self.construct_eip('1', 'eip-1.md', 'sha1')])
+
+        raw_content = EIP.objects.values_list('file_content', flat=True).get(file_name='eip-1.md')
+        self.assertEqual(zlib.decompress(bytes(raw_content)).decode('utf-8'), 'Here markdown text from md file')
+
+        eip = EIP.objects.get(file_name='eip-1.md')
+        self.assertEqual(eip.file_content, 'Here markdown text from md file')
+
+        # Deferred content is loaded and decompressed on access
+        eip = EIP.objects.defer('file_content').get(file_name='eip-1.md')
+        self.assertEqual(eip.get_deferred_fields(), {'file_content'})
+        self.assertEqual(eip.file_content, 'Here markdown text from md file')
+
 
 class EIPsClientAPITestCase(APITestCase):
 
+    eip_dict = {
+        'eip_num': '12',
+        'eip_title': 'Title of EIP',
+        'eip_status': EIP.ACTIVE,
+        'eip_type': EIP.INFORMATIONAL,
+        'eip_category': EIP.ERC,
+        'eip_authors': 'Authors here',
+        'eip_created': '2015-10-27',
+
+        'file_name': 'File name here',
+        'file_download_url': 'https://google.com.ua/',
+        'file_content': 'Here markdown text from md file',
+        'file_sha': '0xjsfidsfseuiui34893hbsfo2i2ifeg',
+    }
+
     def test_should_return_empty_list_of_eips(self):
         url = reverse("eip:eip")
         response = self.client.get(url, format='json')
@@ -211,9 +710,11 @@ class EIPsClientAPITestCase(APITestCase):
         self.assertEqual(eip_response['eip_created'],           eip_dict['eip_created'])
         self.assertEqual(eip_response['file_name'],             eip_dict['file_name'])
         self.assertEqual(eip_response['file_download_url'],     eip_dict['file_download_url'])
-        self.assertEqual(eip_response['file_content'],          eip_dict['file_content'])
         self.assertEqual(eip_response['file_sha'],              eip_dict['file_sha'])
 
+        # Markdown content is not a part of list
+        self.assertNotIn('file_content', eip_response)
+
         # Voting details log
         self.assertEqual(eip_response['voting_details']['proposal_id'], voting_details_log['proposal_id'])
         self.assertEqual(eip_response['voting_details']['is_voting_open'], voting_details_log['is_voting_open'])
@@ -261,3 +762,169 @@ class EIPsClientAPITestCase(APITestCase):
         self.assertEqual(eip_response['file_download_url'],     eip_dict['file_download_url'])
         self.assertEqual(eip_response['file_content'],          eip_dict['file_content'])
         self.assertEqual(eip_response['file_sha'],              eip_dict['file_sha'])
+
+    def test_should_return_only_requested_fields_of_eips(self):
+        EIP.objects.create(**self.eip_dict)
+
+        url = reverse("eip:eip") + '?fields=eip_num,eip_title'
+        response = self.client.get(url, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(set(response.data[0].keys()), {'eip_num', 'eip_title'})
+
+    def test_should_return_only_requested_fields_of_eip(self):
+        eip = EIP.objects.create(**self.eip_dict)
+
+        url = reverse("eip:eip_retrieve", kwargs={'eip_num': eip.eip_num}) + '?fields=eip_num,file_content'
+        response = self.client.get(url, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data, {'eip_num': eip.eip_num, 'file_content': eip.file_content})
+
+    def test_should_load_voting_details_of_eips_with_constant_queries(self):
+        for num in range(1, 11):
+            EIP.objects.create(**dict(self.eip_dict, eip_num=str(num), file_name='eip-{}.md'.format(num)))
+            VotingDetailsLog.objects.create(proposal_id=num, is_voting_open=True, block_number=900000 + num)
+
+        url = reverse("eip:eip")
+
+        # Two aggregates for ETag, one query for EIPs and one for voting details of all of them
+        with self.assertNumQueries(4):
+            response = self.client.get(url, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(all(eip['voting_details'] is not None for eip in response.data))
+
+    def test_should_retrieve_latest_voting_details_of_eip(self):
+        eip = EIP.objects.create(**self.eip_dict)
+        VotingDetailsLog.objects.create(proposal_id=12, is_voting_open=True, block_number=900000)
+        VotingDetailsLog.objects.create(proposal_id=12, is_voting_open=False, block_number=900100)
+
+        url = reverse("eip:eip_retrieve", kwargs={'eip_num': eip.eip_num})
+        response = self.client.get(url, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['voting_details']['block_number'], 900100)
+        self.assertFalse(response.data['voting_details']['is_voting_open'])
+
+    def test_should_search_eips_ranked_by_match(self):
+        EIP.objects.create(**dict(self.eip_dict, eip_num='20', file_name='eip-20.md', eip_title='Token Standard',
+                                  file_content='Interface of fungible tokens'))
+        EIP.objects.create(**dict(self.eip_dict, eip_num='721', file_name='eip-721.md', eip_title='Non-Fungible Ids',
+                                  file_content='Unlike token standard ERC-20, every token is unique'))
+        EIP.objects.create(**dict(self.eip_dict, eip_num='1', file_name='eip-1.md', eip_title='EIP Purpose',
+                                  file_content='Guidelines of the process'))
+
+        url = reverse("eip:eip_search") + '?q=token'
+        response = self.client.get(url, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        # Match in the title is ranked higher than match in the content
+        self.assertEqual([eip['eip_num'] for eip in response.data], ['20', '721'])
+        self.assertNotIn('file_content', response.data[0])
+
+    def test_should_return_empty_search_without_query(self):
+        EIP.objects.create(**self.eip_dict)
+
+        response = self.client.get(reverse("eip:eip_search"), format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data), 0)
+
+    def test_should_retrieve_rendered_html_of_eip(self):
+        eip = EIP.objects.create(**dict(self.eip_dict, file_content='---\neip: 12\n---\n\n## Abstract\n\nText\n\n'
+                                                                   '<script>alert(1)</script>'))
+        eip.render_content().save()
+
+        url = reverse("eip:eip_retrieve", kwargs={'eip_num': eip.eip_num}) + '?render=html'
+        response = self.client.get(url, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotIn('file_content', response.data)
+        self.assertIn('<h2 id="abstract">Abstract</h2>', response.data['file_html'])
+        self.assertNotIn('<script>', response.data['file_html'])
+        self.assertEqual(response.data['file_toc'][0]['id'], 'abstract')
+
+        # Markdown is the default representation
+        url = reverse("eip:eip_retrieve", kwargs={'eip_num': eip.eip_num})
+        response = self.client.get(url, format='json')
+        self.assertNotIn('file_html', response.data)
+        self.assertEqual(response.data['file_content'], eip.file_content)
+
+    def test_should_return_not_modified_eips_by_etag(self):
+        eip = EIP.objects.create(**self.eip_dict)
+
+        url = reverse("eip:eip")
+        response = self.client.get(url, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        etag = response['ETag']
+        response = self.client.get(url, format='json', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        eip.eip_status = EIP.FINAL
+        eip.save()
+
+        response = self.client.get(url, format='json', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_should_return_not_modified_eip_by_etag(self):
+        eip = EIP.objects.create(**self.eip_dict)
+
+        url = reverse("eip:eip_retrieve", kwargs={'eip_num': eip.eip_num})
+        etag = self.client.get(url, format='json')['ETag']
+
+        # ETag is checked before the EIP is serialized
+        with self.assertNumQueries(2):
+            response = self.client.get(url, format='json', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        VotingDetailsLog.objects.create(proposal_id=12, is_voting_open=True, block_number=900000)
+
+        response = self.client.get(url, format='json', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_should_count_facets_of_eips(self):
+        get_redis().incr(FACETS_VERSION_KEY)
+
+        EIP.objects.create(**dict(self.eip_dict, eip_num='1', eip_status=EIP.DRAFT, eip_type=EIP.STANDARDS_TRACK,
+                                  eip_category=EIP.CORE))
+        EIP.objects.create(**dict(self.eip_dict, eip_num='2', eip_status=EIP.FINAL, eip_type=EIP.STANDARDS_TRACK,
+                                  eip_category=EIP.ERC))
+        EIP.objects.create(**dict(self.eip_dict, eip_num='3', eip_status=EIP.FINAL, eip_type=EIP.META,
+                                  eip_category=None))
+
+        url = reverse("eip:eip_facets") + '?type=STANDARDS_TRACK'
+        response = self.client.get(url, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['total'], 2)
+
+        statuses = {facet['key']: facet['count'] for facet in response.data['eip_status']}
+        self.assertEqual(statuses[EIP.DRAFT], 1)
+        self.assertEqual(statuses[EIP.FINAL], 1)
+
+        categories = {facet['key']: facet['count'] for facet in response.data['eip_category']}
+        self.assertEqual(categories[EIP.CORE], 1)
+        self.assertEqual(categories[EIP.NETWORKING], 0)
+
+    def test_should_reject_unknown_facet_filter(self):
+        response = self.client.get(reverse("eip:eip_facets") + '?status=UNKNOWN', format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_should_order_and_filter_eips_by_number(self):
+        for eip_num, eip_status in (('1000', EIP.DRAFT), ('2', EIP.FINAL), ('20', EIP.FINAL), ('155', EIP.DRAFT)):
+            EIP.objects.create(**dict(self.eip_dict, eip_num=eip_num, eip_status=eip_status,
+                                      file_name='eip-{}.md'.format(eip_num)))
+
+        response = self.client.get(reverse("eip:eip"), format='json')
+        self.assertEqual([eip['eip_num'] for eip in response.data], ['2', '20', '155', '1000'])
+
+        url = reverse("eip:eip") + '?status=DRAFT&number_min=100&number_max=999'
+        response = self.client.get(url, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([eip['eip_num'] for eip in response.data], ['155'])
@@ -6,5 +6,10 @@ app_name = 'eip'
 
 urlpatterns = [
     path('', views.EIPsAPIView.as_view(), name='eip'),
-    path('<str:eip_num>/', views.EIPAPIView.as_view(), name='eip_retrieve')
+    path('search/', views.EIPSearchAPIView.as_view(), name='eip_search'),
+    path('facets/', views.EIPFacetsAPIView.as_view(), name='eip_facets'),
+    path('<str:eip_num>/', views.EIPAPIView.as_view(), name='eip_retrieve'),
+    path('<str:eip_num>/revisions/', views.EIPRevisionsAPIView.as_view(), name='eip_revisions'),
+    path('<str:eip_num>/revisions/<str:file_sha>/', views.EIPRevisionAPIView.as_view(), name='eip_revision'),
+    path('<str:eip_num>/diff/', views.EIPDiffAPIView.as_view(), name='eip_diff'),
 ]
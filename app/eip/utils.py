@@ -0,0 +1,58 @@
+# Stdlib imports
+import re
+
+# Pip imports
+import bleach
+import markdown
+
+
+# Front matter block at the beginning of EIP file, it is already parsed into fields of EIP
+FRONT_MATTER = re.compile(r'\A\ufeff?\s*---[ \t]*\r?\n.*?\r?\n---[ \t]*(\r?\n|\Z)', re.DOTALL)
+
+MARKDOWN_EXTENSIONS = [
+    'markdown.extensions.extra',
+    'markdown.extensions.sane_lists',
+    'markdown.extensions.toc',
+]
+
+ALLOWED_TAGS = list(bleach.sanitizer.ALLOWED_TAGS) + [
+    'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'p', 'br', 'hr', 'pre', 'img', 'div', 'span', 'sup', 'sub',
+    'table', 'thead', 'tbody', 'tr', 'th', 'td', 'dl', 'dt', 'dd',
+]
+
+ALLOWED_ATTRIBUTES = {
+    '*': ['id', 'class'],
+    'a': ['href', 'title'],
+    'abbr': ['title'],
+    'acronym': ['title'],
+    'img': ['src', 'alt', 'title'],
+    'th': ['align'],
+    'td': ['align'],
+}
+
+
+def render_eip_markdown(content):
+    """
+    Renders markdown of EIP file into sanitized HTML. The front matter is not rendered,
+    headers get ids, so the table of contents can link them
+
+    :param content: (str) content of EIP file
+    :return: tuple (html, toc), toc is a list of {'id', 'name', 'level', 'children'}
+    """
+    body = FRONT_MATTER.sub('', content or '', count=1)
+
+    md = markdown.Markdown(extensions=MARKDOWN_EXTENSIONS)
+    html = md.convert(body)
+
+    html = bleach.clean(html, tags=ALLOWED_TAGS, attributes=ALLOWED_ATTRIBUTES, strip=True)
+
+    return html, construct_toc(md.toc_tokens)
+
+
+def construct_toc(tokens):
+    return [{
+        'id': token['id'],
+        'name': token['name'],
+        'level': token['level'],
+        'children': construct_toc(token['children']),
+    } for token in tokens]
@@ -1,2 +1,7 @@
 from .eip_api_view import EIPAPIView
-from .eips_api_view import EIPsAPIView
\ No newline at end of file
+from .eips_api_view import EIPsAPIView
+from .eip_search_api_view import EIPSearchAPIView
+from .eip_facets_api_view import EIPFacetsAPIView
+from .eip_revisions_api_view import EIPRevisionsAPIView
+from .eip_revisions_api_view import EIPRevisionAPIView
+from .eip_revisions_api_view import EIPDiffAPIView
\ No newline at end of file
@@ -1,15 +1,57 @@
+# Django imports
+from django.db.models import Max
+from django.utils.decorators import method_decorator
+from django.views.decorators.http import condition
+
 # Pip imports
 from rest_framework import generics
 from rest_framework import permissions
 
+# Project imports
+from base.utils import construct_etag
+from ethereum_client.models import VotingDetailsLog
+
 # App imports
 from ..serializers import EIPSerializer
+from ..serializers import EIPHtmlSerializer
 from ..models import EIP
 
 
+def eip_etag(request, eip_num):
+    """
+    EIP is changed only with its file_sha or updated_at, voting details are new logs of its proposal
+    """
+    eip_state = EIP.objects.filter(eip_num=eip_num).values_list('file_sha', 'updated_at').first()
+    if eip_state is None:
+        return None
+
+    voting_details_state = None
+    if eip_num.isdigit():
+        voting_details_state = VotingDetailsLog.objects.filter(proposal_id=int(eip_num)).aggregate(last_id=Max('id'))['last_id']
+
+    return construct_etag(request, *eip_state, voting_details_state)
+
+
+@method_decorator(condition(etag_func=eip_etag), name='get')
 class EIPAPIView(generics.RetrieveAPIView):
+    """
+    EIP with markdown content of the file, or with pre-rendered HTML and table of contents on ?render=html
+    """
 
     lookup_field = 'eip_num'
     permission_classes = [permissions.AllowAny]
     serializer_class = EIPSerializer
-    queryset = EIP.objects.all()
\ No newline at end of file
+    queryset = EIP.objects.all()
+
+    def get_serializer_class(self):
+        if self.request.query_params.get('render') == 'html':
+            return EIPHtmlSerializer
+        return self.serializer_class
+
+    def get_queryset(self):
+        """
+        Representations of markdown which are not in the response (other representation or not in ?fields=)
+        are not loaded from db
+        """
+        fields = self.get_serializer().fields
+        return self.queryset.defer(*[field for field in EIP.BODY_FIELDS if field not in fields])
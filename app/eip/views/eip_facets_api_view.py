@@ -0,0 +1,33 @@
+# Django imports
+from django.utils.decorators import method_decorator
+from django.views.decorators.http import condition
+
+# Pip imports
+from rest_framework import permissions
+from rest_framework import views
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+
+# App imports
+from ..facets import cached_facets
+from ..facets import count_facets
+from ..filters import EIPFilter
+from ..models import EIP
+from .eips_api_view import eips_etag
+
+
+@method_decorator(condition(etag_func=eips_etag), name='get')
+class EIPFacetsAPIView(views.APIView):
+    """
+    Counts of EIPs per status, type and category. Accepts the same filters as EIPFilter,
+    e.g. ?type=STANDARDS_TRACK&status=DRAFT&status=LAST_CALL
+    """
+
+    permission_classes = [permissions.AllowAny]
+
+    def get(self, request):
+        filterset = EIPFilter(request.query_params, queryset=EIP.objects.all())
+        if not filterset.is_valid():
+            raise ValidationError(filterset.errors)
+
+        return Response(cached_facets(request.query_params, lambda: count_facets(filterset.qs)))
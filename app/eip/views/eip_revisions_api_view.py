@@ -0,0 +1,75 @@
+# Django imports
+from django.http import Http404
+
+# Pip imports
+from rest_framework import generics
+from rest_framework import permissions
+from rest_framework import views
+from rest_framework.response import Response
+
+# App imports
+from ..revisions import diff_contents
+from ..revisions import rebuild_content
+from ..serializers import EIPRevisionSerializer
+from ..models import EIPRevision
+
+
+def get_revision(eip_num, file_sha=None):
+    """
+    The latest revision of EIP with given content, or the latest revision of EIP if sha is not given
+    """
+    revisions = EIPRevision.objects.filter(eip__eip_num=eip_num).order_by('-number')
+    if file_sha is not None:
+        revisions = revisions.filter(file_sha=file_sha)
+
+    revision = revisions.first()
+    if revision is None:
+        raise Http404
+
+    return revision
+
+
+class EIPRevisionsAPIView(generics.ListAPIView):
+    """
+    History of EIP content, the latest revision goes first
+    """
+
+    permission_classes = [permissions.AllowAny]
+    serializer_class = EIPRevisionSerializer
+
+    def get_queryset(self):
+        return EIPRevision.objects.filter(eip__eip_num=self.kwargs['eip_num'])\
+            .defer('snapshot', 'delta')\
+            .order_by('-number')
+
+
+class EIPRevisionAPIView(views.APIView):
+    """
+    Content of EIP file with given sha, rebuilt from stored revisions
+    """
+
+    permission_classes = [permissions.AllowAny]
+
+    def get(self, request, eip_num, file_sha):
+        revision = get_revision(eip_num, file_sha)
+
+        return Response(dict(EIPRevisionSerializer(instance=revision).data,
+                             file_content=rebuild_content(revision)))
+
+
+class EIPDiffAPIView(views.APIView):
+    """
+    Unified diff between two versions of EIP file: ?from=<sha>&to=<sha>, the latest version is used by default
+    """
+
+    permission_classes = [permissions.AllowAny]
+
+    def get(self, request, eip_num):
+        from_revision = get_revision(eip_num, request.query_params.get('from'))
+        to_revision = get_revision(eip_num, request.query_params.get('to'))
+
+        return Response({
+            'from': EIPRevisionSerializer(instance=from_revision).data,
+            'to': EIPRevisionSerializer(instance=to_revision).data,
+            'diff': diff_contents(from_revision, to_revision),
+        })
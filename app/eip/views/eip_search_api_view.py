@@ -0,0 +1,39 @@
+# Django imports
+from django.contrib.postgres.search import SearchQuery
+from django.contrib.postgres.search import SearchRank
+from django.db.models import F
+from django.utils.decorators import method_decorator
+from django.views.decorators.http import condition
+
+# Pip imports
+from rest_framework import generics
+from rest_framework import permissions
+
+# App imports
+from ..serializers import EIPsSerializer
+from ..models import EIP
+from .eips_api_view import eips_etag
+
+
+@method_decorator(condition(etag_func=eips_etag), name='get')
+class EIPSearchAPIView(generics.ListAPIView):
+    """
+    Full text search of EIPs by title, authors and content: ?q=<query>
+    Matches are found with GIN index of stored search documents and ordered by rank,
+    matches in title go before matches in content
+    """
+
+    permission_classes = [permissions.AllowAny]
+    serializer_class = EIPsSerializer
+
+    def get_queryset(self):
+        query = self.request.query_params.get('q', '').strip()
+        if not query:
+            return EIP.objects.none()
+
+        search_query = SearchQuery(query)
+
+        return EIP.objects.defer(*EIP.BODY_FIELDS)\
+            .filter(search_vector=search_query)\
+            .annotate(rank=SearchRank(F('search_vector'), search_query))\
+            .order_by('-rank', 'eip_num')
@@ -1,14 +1,39 @@
+# Django imports
+from django.db.models import Count
+from django.db.models import Max
+from django.utils.decorators import method_decorator
+from django.views.decorators.http import condition
+
 # Pip imports
 from rest_framework import generics
 from rest_framework import permissions
 
+# Project imports
+from base.utils import construct_etag
+from ethereum_client.models import VotingDetailsLog
+
 # App imports
-from ..serializers import EIPSerializer
+from ..filters import EIPFilter
+from ..serializers import EIPsSerializer
 from ..models import EIP
 
 
+def eips_etag(request, *args, **kwargs):
+    """
+    EIPs are changed only with updated_at, voting details are new logs
+    """
+    eips_state = EIP.objects.aggregate(count=Count('id'), last_updated=Max('updated_at'))
+    voting_details_state = VotingDetailsLog.objects.aggregate(last_id=Max('id'))
+
+    return construct_etag(request, eips_state['count'], eips_state['last_updated'], voting_details_state['last_id'])
+
+
+@method_decorator(condition(etag_func=eips_etag), name='get')
 class EIPsAPIView(generics.ListAPIView):
 
     permission_classes = [permissions.AllowAny]
-    serializer_class = EIPSerializer
-    queryset = EIP.objects.all()
+    serializer_class = EIPsSerializer
+    filterset_class = EIPFilter
+
+    # Markdown content and its HTML are not a part of list representation, so they are not loaded from db
+    queryset = EIP.objects.defer(*EIP.BODY_FIELDS).order_by('eip_number', 'eip_num')
@@ -0,0 +1,17 @@
+# Generated by Django 2.2.24 on 2026-10-18 10:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ethereum_client', '0003_auto_20190224_0850'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='votingdetailslog',
+            index=models.Index(fields=['proposal_id', '-block_number'], name='ethereum_cl_proposa_2d9f5c_idx'),
+        ),
+    ]
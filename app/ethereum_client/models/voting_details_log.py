@@ -17,6 +17,24 @@ class VotingDetailsLog(TimeStampedModel):
 
     block_number            = models.IntegerField()
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['proposal_id', '-block_number']),
+        ]
+
     def __str__(self):
         return "Proposal: {}, active: {}, block: {}".format(self.proposal_id, self.is_voting_open, self.block_number)
 
+    @classmethod
+    def latest_by_proposals(cls, proposal_ids):
+        """
+        Loads the latest log (by block number) of every proposal with one query
+
+        :param proposal_ids: list of proposal ids
+        :return: dict {proposal_id: VotingDetailsLog}
+        """
+        logs = cls.objects.filter(proposal_id__in=proposal_ids)\
+            .order_by('proposal_id', '-block_number', '-id')\
+            .distinct('proposal_id')
+
+        return {log.proposal_id: log for log in logs}
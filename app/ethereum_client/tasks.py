@@ -92,7 +92,7 @@ def load_voting_details_logs():
                 cache[eip_num] = log.block_number
                 if not eip.voting_details or eip.voting_details.block_number < log.block_number:
                     eip.voting_details = log
-                    eip.save()
+                    eip.save(update_fields=['voting_details', 'updated_at'])
 
         except EIP.DoesNotExist:
             logger.error("Can't update EIP, the EIP with id: {} does not exists".format(eip_num))
@@ -2,12 +2,18 @@
 import logging
 
 # Django imports
+from django.db.models import Count
+from django.db.models import Max
 from django.db.models import Sum
+from django.views.decorators.http import condition
 
 # Pip imports
 from rest_framework.decorators import api_view
 from rest_framework.response import Response
 
+# Project imports
+from base.utils import construct_etag
+
 # App imports
 from ..models import EthVoter
 from ..models import VoteLog
@@ -15,7 +21,19 @@ from ..models import VoteLog
 logger = logging.getLogger(__name__)
 
 
+def gas_voting_etag(request, proposal_id):
+    """
+    Votes of the proposal are changed with new processed blocks, used gas of voters with their updated_at
+    """
+    votes_state = VoteLog.objects.filter(proposal_id=proposal_id)\
+        .aggregate(count=Count('id'), last_block=Max('block_number'))
+    voters_state = EthVoter.objects.aggregate(last_updated=Max('updated_at'))
+
+    return construct_etag(request, votes_state['count'], votes_state['last_block'], voters_state['last_updated'])
+
+
 @api_view(['GET'])
+@condition(etag_func=gas_voting_etag)
 def gas_voting_view(request, proposal_id):
     vote_addresses = VoteLog.objects.filter(proposal_id=proposal_id).values_list('voter', flat=True)
 
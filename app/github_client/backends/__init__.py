@@ -0,0 +1,5 @@
+from .storage_backend import StorageBackend
+from .storage_backend import RevisionReader
+from .remote_git_hub_backend import RemoteGitHubBackend
+from .local_git_backend import LocalGitBackend
+from .in_memory_backend import InMemoryBackend
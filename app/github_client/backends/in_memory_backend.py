@@ -0,0 +1,64 @@
+# Stdlib imports
+import hashlib
+import threading
+
+# App imports
+from github_client.utils import git_blob_sha
+from .storage_backend import StorageBackend
+
+
+class InMemoryBackend(StorageBackend):
+    """
+    Keeps files in memory of the process, for tests and benchmarks without network.
+    Files are shared by all instances, call reset() to start from the empty repo
+    """
+
+    files = {}
+
+    commits = []
+
+    lock = threading.Lock()
+
+    @classmethod
+    def reset(cls):
+        with cls.lock:
+            cls.files.clear()
+            cls.commits.clear()
+
+    def read_file(self, file_path, ref=None):
+        # Writes are serialized by the lock, files are always read at the head
+        content = self.files.get(file_path)
+        if content is None:
+            return None
+
+        return content, git_blob_sha(content)
+
+    def list_files(self):
+        return {file_path: git_blob_sha(content) for file_path, content in self.files.items()}
+
+    def iter_files(self, folder):
+        for file_path, content in sorted(self.files.items()):
+            if file_path.startswith(folder + '/'):
+                yield file_path, content
+
+    def write_files(self, files, message, author, build=None):
+        with self.lock:
+            if build is not None:
+                files = build(self, files)
+
+            changed = {file_path: content for file_path, content in files.items()
+                       if self.files.get(file_path) != content}
+            if not changed:
+                return None
+
+            for file_path, content in changed.items():
+                if content is None:
+                    self.files.pop(file_path, None)
+                else:
+                    self.files[file_path] = content
+
+            commit_sha = hashlib.sha1('{}|{}|{}'.format(len(self.commits), message, sorted(changed)).encode('utf-8'))\
+                .hexdigest()
+            self.commits.append((commit_sha, message, author, sorted(changed)))
+
+            return commit_sha
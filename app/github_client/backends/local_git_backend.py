@@ -0,0 +1,155 @@
+# Stdlib imports
+import logging
+import os
+import tempfile
+
+# Django imports
+from django.conf import settings
+
+# App imports
+from github_client.git_command import GitCommandError
+from github_client.git_command import parse_cat_file_batch
+from github_client.git_command import parse_ls_tree
+from github_client.git_command import run_git
+from .storage_backend import RevisionReader
+from .storage_backend import StorageBackend
+
+
+logger = logging.getLogger(__name__)
+
+
+class LocalGitBackend(StorageBackend):
+    """
+    Writes files to the local bare clone of GitHub repo, commits are created with git plumbing
+    at disk speed and pushed to GitHub periodically by github_client.tasks.push_github_db.
+
+    The clone is the only writer of the branch, commits made to GitHub repo in other ways are rejected on push.
+    Credentials are passed to git through the environment, they are never written to the url or the clone
+    """
+
+    # Attempts to move the branch when other writer moved it meanwhile
+    write_attempts = 3
+
+    def __init__(self, repo_path=None, remote_url=None, branch=None):
+        self.repo_path = repo_path or settings.GITHUB_DB_LOCAL_PATH
+        self.remote_url = remote_url or settings.GITHUB_DB_REMOTE_URL or self.construct_remote_url()
+        self.credentials = (settings.GITHUB_USERNAME, settings.GITHUB_PASSWORD) if settings.GITHUB_USERNAME else None
+        self.branch = branch or settings.GITHUB_DB_BRANCH
+        self.ref = 'refs/heads/{}'.format(self.branch)
+
+    def read_file(self, file_path, ref=None):
+        entries = parse_ls_tree(self.git('ls-tree', '-z', ref or self.ref, '--', file_path))
+        if not entries:
+            return None
+
+        path, sha = entries[0]
+        return self.git('cat-file', 'blob', sha).decode('utf-8'), sha
+
+    def list_files(self):
+        return dict(parse_ls_tree(self.git('ls-tree', '-r', '-z', self.ref)))
+
+    def iter_files(self, folder):
+        entries = parse_ls_tree(self.git('ls-tree', '-r', '-z', self.ref, '--', folder))
+        if not entries:
+            return
+
+        # All blobs are read with one git process
+        shas = [sha for path, sha in entries]
+        contents = parse_cat_file_batch(self.git('cat-file', '--batch', input='\n'.join(shas).encode('utf-8') + b'\n'))
+
+        for path, sha in entries:
+            yield path, contents[sha].decode('utf-8')
+
+    def write_files(self, files, message, author, build=None):
+        """
+        Builds the tree in a temporary index on top of the branch head and moves the branch to the new commit
+        """
+        for attempt in range(1, self.write_attempts + 1):
+            head_sha = self.git('rev-parse', '--verify', self.ref).decode('utf-8').strip()
+            repo_files = build(RevisionReader(self, head_sha), files) if build else files
+
+            with tempfile.TemporaryDirectory() as tmp_dir:
+                env = {'GIT_INDEX_FILE': os.path.join(tmp_dir, 'index')}
+                self.git('read-tree', head_sha, env=env)
+                self.git('update-index', '--index-info', env=env,
+                         input=self.construct_index_info(repo_files, tmp_dir).encode('utf-8'))
+                tree_sha = self.git('write-tree', env=env).decode('utf-8').strip()
+
+            if tree_sha == self.git('rev-parse', '{}^{{tree}}'.format(head_sha)).decode('utf-8').strip():
+                return None
+
+            commit_sha = self.git('commit-tree', tree_sha, '-p', head_sha, '-m', message, env={
+                'GIT_AUTHOR_NAME': author,
+                'GIT_AUTHOR_EMAIL': 'unknown@example.com',
+                'GIT_COMMITTER_NAME': author,
+                'GIT_COMMITTER_EMAIL': 'unknown@example.com',
+            }).decode('utf-8').strip()
+
+            try:
+                # The branch is moved only if nobody moved it meanwhile
+                self.git('update-ref', self.ref, commit_sha, head_sha)
+            except GitCommandError:
+                if attempt == self.write_attempts:
+                    raise
+                continue
+
+            return commit_sha
+
+    def push(self):
+        """
+        Pushes commits of the branch to GitHub repo
+        :return:
+        """
+        self.ensure_repo()
+        self.git('push', self.remote_url, '{0}:{0}'.format(self.ref), credentials=self.credentials)
+
+
+    """
+    Utils / Helpers
+    """
+
+    def ensure_repo(self):
+        """
+        Clones the repo if the local clone doesn't exist yet
+        :return:
+        """
+        if not os.path.isdir(self.repo_path):
+            self.git('clone', '--bare', '--single-branch', '--branch', self.branch, self.remote_url, self.repo_path,
+                     in_repo=False, credentials=self.credentials)
+
+    def git(self, *args, in_repo=True, input=None, env=None, credentials=None):
+        if in_repo:
+            self.ensure_repo()
+
+        return run_git(*args, git_dir=self.repo_path if in_repo else None, input=input, env=env,
+                       credentials=credentials)
+
+    def construct_index_info(self, files, tmp_dir):
+        """
+        Writes blobs of changed files with one git process and builds input of update-index
+
+        :param files: dict {file_path: content or None to delete the file}
+        :param tmp_dir: directory for contents of blobs
+        :return: (str) lines "<mode> <sha>\\t<path>", zero mode removes the path
+        """
+        updates = sorted((file_path, content) for file_path, content in files.items() if content is not None)
+        blob_paths = []
+        for position, (file_path, content) in enumerate(updates):
+            blob_path = os.path.join(tmp_dir, 'blob{}'.format(position))
+            with open(blob_path, 'w', encoding='utf-8', newline='') as blob:
+                blob.write(content)
+            blob_paths.append(blob_path)
+
+        shas = []
+        if blob_paths:
+            shas = self.git('hash-object', '-w', '--no-filters', '--stdin-paths',
+                            input='\n'.join(blob_paths).encode('utf-8') + b'\n').decode('utf-8').split()
+
+        lines = ['100644 {}\t{}'.format(sha, file_path) for (file_path, content), sha in zip(updates, shas)]
+        lines += ['0 {}\t{}'.format('0' * 40, file_path) for file_path, content in files.items() if content is None]
+
+        return '\n'.join(lines) + '\n'
+
+    def construct_remote_url(self):
+        return 'https://github.com/{}.git'.format(settings.GITHUB_DB_REPO)
+
@@ -0,0 +1,167 @@
+# Stdlib imports
+import logging
+import tarfile
+from contextlib import closing
+
+# Django imports
+from django.conf import settings
+from django.utils import timezone
+
+# Pip imports
+import requests
+
+# App imports
+from github_client.utils import git_blob_sha
+from github_client.services.github_session import GitHubSession
+from .storage_backend import RevisionReader
+from .storage_backend import StorageBackend
+
+
+logger = logging.getLogger(__name__)
+
+
+class RemoteGitHubBackend(StorageBackend):
+    """
+    Writes files straight to GitHub repo through REST API
+    """
+
+    # Attempts to move the branch when other writer moved it meanwhile
+    write_attempts = 3
+
+    def __init__(self, repo_name=None, branch=None):
+        self.repo_name = repo_name or settings.GITHUB_DB_REPO
+        self.branch = branch or settings.GITHUB_DB_BRANCH
+        self.session = GitHubSession()
+
+    def read_file(self, file_path, ref=None):
+        """
+        Reads the file from the branch with conditional request, so not changed files are served from the cache.
+        Files of the commit (ref) are read for one write only, they are not cached.
+        Raw media type is requested: JSON of contents API has no content for files bigger than 1 MB
+        """
+        path = '/repos/{}/contents/{}'.format(self.repo_name, file_path)
+        headers = {'Accept': 'application/vnd.github.v3.raw'}
+
+        try:
+            if ref is None:
+                content = self.session.get(path, params={'ref': self.branch}, headers=headers)
+            else:
+                content = self.session.request('GET', path, params={'ref': ref}, headers=headers)
+        except requests.HTTPError as ex:
+            if ex.response is not None and ex.response.status_code == 404:
+                return None
+            raise
+
+        content = content.decode('utf-8')
+        return content, git_blob_sha(content)
+
+    def list_files(self):
+        head_sha, tree_sha = self.head()
+        tree = self.session.request_json('GET', '/repos/{}/git/trees/{}'.format(self.repo_name, tree_sha),
+                                         params={'recursive': 1})
+        if tree.get('truncated', False):
+            logger.warning("Tree of {} is truncated by GitHub, not all files are listed".format(self.repo_name))
+
+        return {element['path']: element['sha'] for element in tree['tree'] if element['type'] == "blob"}
+
+    def iter_files(self, folder):
+        """
+        Downloads the branch as one tarball, files are parsed while the archive is streamed
+        """
+        with closing(self.session.open_stream('/repos/{}/tarball/{}'.format(self.repo_name, self.branch))) \
+                as response:
+            yield from iter_archive_files(response.raw, folder)
+
+    def write_files(self, files, message, author, build=None):
+        """
+        Writes many files with one commit through Git Data API: a tree with changed files is created
+        on top of the tree of the branch head, then the branch is moved to the new commit.
+        The tree of the repo is never listed, files which are not changed are skipped by GitHubDB (sync state),
+        the write of the same content is detected by the sha of the new tree
+        """
+        repo_path = '/repos/{}'.format(self.repo_name)
+
+        for attempt in range(1, self.write_attempts + 1):
+            head_sha, tree_sha = self.head()
+            repo_files = build(RevisionReader(self, head_sha), files) if build else files
+
+            elements = self.construct_tree_elements(repo_files, head_sha)
+            if not elements:
+                return None
+
+            tree = self.session.request_json('POST', '{}/git/trees'.format(repo_path), {
+                'base_tree': tree_sha,
+                'tree': elements,
+            })
+            if tree['sha'] == tree_sha:
+                return None
+
+            commit = self.session.request_json('POST', '{}/git/commits'.format(repo_path), {
+                'message': message,
+                'tree': tree['sha'],
+                'parents': [head_sha],
+                'author': {'name': author, 'email': 'unknown@example.com', 'date': timezone.now().isoformat()},
+            })
+
+            try:
+                self.session.request_json('PATCH', '{}/git/refs/heads/{}'.format(repo_path, self.branch),
+                                          {'sha': commit['sha']})
+            except requests.HTTPError as ex:
+                # Not fast-forward: the branch was moved meanwhile, the batch is applied again on top of the new head
+                if ex.response is None or ex.response.status_code != 422 or attempt == self.write_attempts:
+                    raise
+                continue
+
+            return commit['sha']
+
+
+    """
+    Utils / Helpers
+    """
+
+    def head(self):
+        """
+        Head is moved by every write, so it is never read from the cache
+
+        :return: tuple (sha of the head commit of the branch, sha of its tree)
+        """
+        head = self.session.request_json('GET', '/repos/{}/git/ref/heads/{}'.format(self.repo_name, self.branch))
+        head_sha = head['object']['sha']
+        commit = self.session.request_json('GET', '/repos/{}/git/commits/{}'.format(self.repo_name, head_sha))
+
+        return head_sha, commit['tree']['sha']
+
+    def construct_tree_elements(self, files, head_sha):
+        """
+        Builds elements of the git tree for changed files. File is deleted by the element with null sha,
+        PyGithub InputGitTreeElement doesn't allow it, so the raw elements are used.
+        GitHub rejects the delete of the missing path, so deleted files are checked at the head
+
+        :param files: dict {file_path: content or None to delete the file}
+        :param head_sha: sha of the commit which the tree is built on
+        :return: list of dict
+        """
+        elements = []
+        for file_path, content in sorted(files.items()):
+            if content is not None:
+                elements.append({'path': file_path, 'mode': '100644', 'type': 'blob', 'content': content})
+            elif self.read_file(file_path, ref=head_sha) is not None:
+                elements.append({'path': file_path, 'mode': '100644', 'type': 'blob', 'sha': None})
+
+        return elements
+
+
+def iter_archive_files(archive, folder):
+    """
+    Reads files of the folder from .tar.gz archive of the repo
+
+    :param archive: file object, it is read sequentially
+    :param folder: name of the folder, e.g. stances
+    :return: generator of tuples (file_path, content)
+    """
+    with tarfile.open(fileobj=archive, mode='r|gz') as tar:
+        for member in tar:
+            # Archive has all files inside of the folder named by the repo and the commit
+            file_path = member.name.split('/', 1)[-1]
+            if member.isfile() and file_path.startswith(folder + '/'):
+                yield file_path, tar.extractfile(member).read().decode('utf-8')
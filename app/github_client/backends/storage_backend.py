@@ -0,0 +1,71 @@
+# Stdlib imports
+from abc import ABC
+from abc import abstractmethod
+
+
+class StorageBackend(ABC):
+    """
+    Storage of files of GitHubDB. Files are addressed by the path inside of the branch,
+    every write of files is one commit. Backend is selected by settings.GITHUB_DB_BACKEND
+    """
+
+    @abstractmethod
+    def read_file(self, file_path, ref=None):
+        """
+        :param file_path:
+        :param ref: sha of the commit to read from, the head of the branch by default
+        :return: tuple (content, blob sha) or None if the file doesn't exist
+        """
+        pass
+
+    @abstractmethod
+    def list_files(self):
+        """
+        :return: dict {file_path: blob sha} of all files of the branch
+        """
+        pass
+
+    @abstractmethod
+    def iter_files(self, folder):
+        """
+        Yields contents of all files of the folder, files are read in bulk
+
+        :param folder: name of the folder, e.g. stances
+        :return: generator of tuples (file_path, content)
+        """
+        pass
+
+    @abstractmethod
+    def write_files(self, files, message, author, build=None):
+        """
+        Writes files with one commit, deletes of missing files are skipped
+
+        :param files: dict {file_path: content or None to delete the file}
+        :param message: message of the commit
+        :param author: The author of the commit
+        :param build: function (reader, files) -> files of the repo, e.g. build_files of the layout.
+                      It reads files from the commit which the new commit is built on (RevisionReader),
+                      so read-modify-write is built again when the branch is moved meanwhile
+        :return: sha of the commit or None if nothing is changed
+        """
+        pass
+
+    def push(self):
+        """
+        Publishes written commits to GitHub. Backends which write to GitHub directly have nothing to push
+        :return:
+        """
+        pass
+
+
+class RevisionReader:
+    """
+    Reads files of the backend at one commit, e.g. the head which the new commit is built on
+    """
+
+    def __init__(self, backend, ref):
+        self.backend = backend
+        self.ref = ref
+
+    def read_file(self, file_path):
+        return self.backend.read_file(file_path, ref=self.ref)
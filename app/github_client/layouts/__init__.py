@@ -0,0 +1,2 @@
+from .file_layout import FileLayout
+from .ndjson_shard_layout import NDJSONShardLayout
@@ -0,0 +1,81 @@
+# App imports
+from github_client.utils import git_blob_sha
+
+
+class FileLayout:
+    """
+    Every model is stored in its own JSON file: <folder>/<id>.json.
+
+    GitHubDB works with these paths of models (logical files), layouts map them to files of the repo.
+    Layout is selected by settings.GITHUB_DB_LAYOUT
+    """
+
+    extension = '.json'
+
+    def read_file(self, backend, file_path):
+        """
+        :param backend: (StorageBackend)
+        :param file_path: logical path of the model
+        :return: tuple (content, sha) or None if the model is not stored
+        """
+        return backend.read_file(file_path)
+
+    def build_files(self, backend, files):
+        """
+        Turns changes of models into changes of files of the repo
+
+        :param backend: (RevisionReader) files of the commit which the changes are written on
+        :param files: dict {logical file_path: content or None to delete the model}
+        :return: dict {file_path: content or None to delete the file}
+        """
+        return dict(files)
+
+    def pack(self, documents):
+        """
+        Builds all files of the repo from all models
+
+        :param documents: iterable of tuples (logical file_path, content)
+        :return: dict {file_path: content}
+        """
+        return dict(documents)
+
+    def expected_shas(self, documents):
+        """
+        Computes blob shas of files of the repo which store the models, without building all files at once
+
+        :param documents: iterable of tuples (logical file_path, content) ordered by id of models
+        :return: dict {file_path: blob sha}
+        """
+        return {file_path: git_blob_sha(content) for file_path, content in documents}
+
+    def id_range(self, file_path):
+        """
+        :param file_path: path of the file of the repo
+        :return: tuple (first id, last id) of models which the file stores
+                 or None if the name is not an id (e.g. index.json added to the repo by hand)
+        """
+        try:
+            model_id = int(file_path.rsplit('/', 1)[-1][:-len(self.extension)])
+        except ValueError:
+            return None
+
+        return model_id, model_id
+
+    def iter_documents(self, backend, folder):
+        """
+        Reads all models of the folder in bulk
+
+        :param backend: (StorageBackend)
+        :param folder: name of the folder, e.g. stances
+        :return: generator of tuples (logical file_path, content)
+        """
+        for file_path, content in backend.iter_files(folder):
+            if self.is_layout_file(file_path):
+                yield file_path, content
+
+    def is_layout_file(self, file_path):
+        return file_path.endswith(self.extension) and self.id_range(file_path) is not None
+
+    @staticmethod
+    def document_path(folder, model_id):
+        return '{}/{}{}'.format(folder, model_id, FileLayout.extension)
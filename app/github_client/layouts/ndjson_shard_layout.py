@@ -0,0 +1,149 @@
+# Stdlib imports
+import json
+from collections import defaultdict
+
+# Django imports
+from django.conf import settings
+
+# App imports
+from github_client.utils import git_blob_sha
+from .file_layout import FileLayout
+
+
+class NDJSONShardLayout(FileLayout):
+    """
+    Models are grouped by ranges of ids into NDJSON files: <folder>/<first id>-<last id>.ndjson,
+    one line per model ordered by id. The repo keeps thousands of times less files, so tree listings,
+    clones and restores don't slow down with the amount of models.
+
+    Change of models rewrites only shards which contain them. Shard is patched by read-modify-write
+    of its content at the commit which the write is built on,
+    so the repo must have one writer, see github_client.tasks.push_github_outbox
+    """
+
+    extension = '.ndjson'
+
+    def __init__(self, shard_size=None):
+        self.shard_size = shard_size or settings.GITHUB_DB_SHARD_SIZE
+
+    def read_file(self, backend, file_path):
+        stored = backend.read_file(self.shard_path(file_path))
+        if stored is None:
+            return None
+
+        content = self.parse_shard(self.shard_path(file_path), stored[0]).get(self.model_id(file_path))
+        if content is None:
+            return None
+
+        return content, git_blob_sha(content)
+
+    def build_files(self, backend, files):
+        changes = defaultdict(dict)
+        for file_path, content in files.items():
+            changes[self.shard_path(file_path)][self.model_id(file_path)] = content
+
+        shards = {}
+        for shard_path, shard_changes in changes.items():
+            # Shard which can't be parsed raises the error, otherwise its models would be deleted by the write
+            stored = backend.read_file(shard_path)
+            lines = self.parse_shard(shard_path, stored[0]) if stored else {}
+
+            for model_id, content in shard_changes.items():
+                if content is None:
+                    lines.pop(model_id, None)
+                else:
+                    lines[model_id] = content
+
+            shards[shard_path] = self.construct_shard(lines)
+
+        return shards
+
+    def pack(self, documents):
+        shards = defaultdict(dict)
+        for file_path, content in documents:
+            shards[self.shard_path(file_path)][self.model_id(file_path)] = content
+
+        return {shard_path: self.construct_shard(lines) for shard_path, lines in shards.items()}
+
+    def expected_shas(self, documents):
+        # Models go in order of ids, so every shard is complete when the next one starts
+        shas = {}
+        shard_path, lines = None, {}
+        for file_path, content in documents:
+            if self.shard_path(file_path) != shard_path:
+                if lines:
+                    shas[shard_path] = git_blob_sha(self.construct_shard(lines))
+                shard_path, lines = self.shard_path(file_path), {}
+
+            lines[self.model_id(file_path)] = content
+
+        if lines:
+            shas[shard_path] = git_blob_sha(self.construct_shard(lines))
+
+        return shas
+
+    def id_range(self, file_path):
+        try:
+            first_id, last_id = file_path.rsplit('/', 1)[-1][:-len(self.extension)].split('-')
+            return int(first_id), int(last_id)
+        except ValueError:
+            return None
+
+    def iter_documents(self, backend, folder):
+        for shard_path, shard_content in backend.iter_files(folder):
+            if not self.is_layout_file(shard_path):
+                continue
+
+            for model_id, content in sorted(self.parse_shard(shard_path, shard_content).items()):
+                yield self.document_path(folder, model_id), content
+
+
+    """
+    Utils / Helpers
+    """
+
+    def shard_path(self, file_path):
+        """
+        :param file_path: logical path of the model, e.g. stances/1234.json
+        :return: path of the shard, e.g. stances/1000-1999.ndjson
+        """
+        folder = file_path.rsplit('/', 1)[0]
+        first_id = self.model_id(file_path) // self.shard_size * self.shard_size
+
+        return '{}/{}-{}{}'.format(folder, first_id, first_id + self.shard_size - 1, self.extension)
+
+    def model_id(self, file_path):
+        return int(file_path.rsplit('/', 1)[-1][:-len(FileLayout.extension)])
+
+    def parse_shard(self, shard_path, shard_content):
+        """
+        Shards without models are deleted, so the empty content is never a valid shard
+
+        :param shard_path: path of the shard, for the error message
+        :param shard_content: content of the shard
+        :return: dict {id: content} of models of the shard
+        """
+        lines = {}
+        for line in shard_content.splitlines():
+            if not line:
+                continue
+
+            try:
+                lines[json.loads(line)['id']] = line
+            except (ValueError, TypeError, KeyError) as ex:
+                raise ValueError("Shard '{}' has a line which is not a model: '{}'".format(shard_path, ex))
+
+        if not lines:
+            raise ValueError("Shard '{}' is empty".format(shard_path))
+
+        return lines
+
+    def construct_shard(self, lines):
+        """
+        :param lines: dict {id: content}
+        :return: content of the shard or None if it has no models
+        """
+        if not lines:
+            return None
+
+        return ''.join(lines[model_id] + '\n' for model_id in sorted(lines))
@@ -0,0 +1,97 @@
+# Stdlib imports
+import os
+import time
+from collections import Counter
+
+# Django imports
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.core.management import CommandError
+
+# App imports
+from github_client.services import GitMirrorEIP
+from github_client.utils import parse_eip_details
+
+
+# Reduced snapshot: preambles of a few EIPs which cover the variants of the format, bodies are trimmed.
+# It is too small for timings, the full EIPS folder of the mirror is measured by default
+SNAPSHOT_CORPUS_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 'tests_data', 'eips')
+
+
+class Command(BaseCommand):
+    help = 'Measures parsing of the EIPs corpus: all EIP files of the local mirror (settings.EIPS_MIRROR_PATH) ' \
+           'or of the given folder'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--path', dest='path', default=None,
+            help='Folder with EIP markdown files, e.g. {} (reduced snapshot). '
+                 'EIPS folder of the mirror is used by default.'.format(SNAPSHOT_CORPUS_PATH),
+        )
+        parser.add_argument(
+            '--repeat', dest='repeat', default=10, type=int,
+            help='How many times the whole corpus is parsed.',
+        )
+
+    def handle(self, *args, **options):
+        path = options.get('path')
+        repeat = max(options.get('repeat'), 1)
+
+        contents = self.read_folder(path) if path else self.read_mirror()
+        if len(contents) == 0:
+            raise CommandError("No EIP files in '{}'".format(path or settings.EIPS_MIRROR_PATH))
+
+        statuses = Counter()
+        errors = []
+
+        for file_name, content in contents:
+            try:
+                statuses[parse_eip_details(content)[2]] += 1
+            except Exception as ex:
+                errors.append((file_name, ex))
+
+        started_at = time.perf_counter()
+        for _ in range(repeat):
+            for file_name, content in contents:
+                try:
+                    parse_eip_details(content)
+                except Exception:
+                    pass
+        elapsed = time.perf_counter() - started_at
+
+        parsed_files = len(contents) * repeat
+        self.stdout.write("Files: {}, repeats: {}".format(len(contents), repeat))
+        self.stdout.write("Total: {:.3f} s, per file: {:.1f} us, {:.0f} files/s".format(
+            elapsed, elapsed / parsed_files * 1000000, parsed_files / elapsed))
+        self.stdout.write("Statuses: {}".format(", ".join(
+            "{}: {}".format(status, count) for status, count in statuses.most_common())))
+
+        for file_name, ex in errors:
+            self.stderr.write("Can't parse '{}': {}".format(file_name, ex))
+
+
+    """
+    Utils / Helpers
+    """
+
+    def read_folder(self, path):
+        if not os.path.isdir(path):
+            raise CommandError("Folder '{}' doesn't exist".format(path))
+
+        contents = []
+        for file_name in sorted(os.listdir(path)):
+            if file_name.endswith('.md'):
+                with open(os.path.join(path, file_name), encoding='utf-8') as f:
+                    contents.append((file_name, f.read()))
+
+        return contents
+
+    def read_mirror(self):
+        """
+        Updates the local mirror of the official repo and reads all EIP files of its branch
+        """
+        mirror = GitMirrorEIP()
+        eip_files = [eip_file for eip_file in mirror.eips_list() if eip_file.name.endswith('.md')]
+        mirror.prefetch(eip_files)
+
+        return [(eip_file.name, mirror.blobs[eip_file.sha]) for eip_file in eip_files if eip_file.sha in mirror.blobs]
@@ -0,0 +1,50 @@
+# Django imports
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.core.management import CommandError
+from django.utils.module_loading import import_string
+
+# Project imports
+from base.redis_client import get_redis
+
+# App imports
+from github_client.services import GitHubDB
+from github_client.tasks import WRITE_LOCK_KEY
+
+
+class Command(BaseCommand):
+    help = 'Moves models in GitHubDB repo from the layout of settings.GITHUB_DB_LAYOUT to other layout with one commit'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'layout',
+            help='Import path of the new layout, e.g. github_client.layouts.NDJSONShardLayout',
+        )
+        parser.add_argument(
+            '--folder', dest='folder', default='stances',
+            help='Folder of models which are moved.',
+        )
+        parser.add_argument(
+            '--lock-timeout', dest='lock_timeout', default=60 * 60, type=int,
+            help='Seconds while the outbox is not pushed during the migration.',
+        )
+
+    def handle(self, *args, **options):
+        try:
+            layout = import_string(options.get('layout'))()
+        except ImportError as ex:
+            raise CommandError("Layout '{}' doesn't exist: {}".format(options.get('layout'), ex))
+
+        # Outbox and reconcile hold the same lock, so files of the old layout are not written during the migration
+        lock = get_redis().lock(WRITE_LOCK_KEY, timeout=options.get('lock_timeout'))
+        if not lock.acquire(blocking_timeout=settings.GITHUB_OUTBOX_LOCK_TIMEOUT):
+            raise CommandError("GitHubDB repo is being written, try again later")
+
+        try:
+            moved, commit_sha = GitHubDB().migrate_layout(options.get('folder'), layout)
+        finally:
+            lock.release()
+
+        self.stdout.write("Moved {} models, commit: {}".format(moved, commit_sha or 'nothing is changed'))
+        self.stdout.write("Set GITHUB_DB_LAYOUT={} (current is {})".format(options.get('layout'),
+                                                                            settings.GITHUB_DB_LAYOUT))
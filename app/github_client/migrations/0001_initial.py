@@ -0,0 +1,27 @@
+# Generated by Django 2.2.24 on 2026-10-18 10:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='GitHubOutbox',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('file_path', models.CharField(max_length=255)),
+                ('content', models.TextField(blank=True, null=True)),
+            ],
+            options={
+                'abstract': False,
+            },
+        ),
+    ]
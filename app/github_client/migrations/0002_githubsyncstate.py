@@ -0,0 +1,26 @@
+# Generated by Django 2.2.24 on 2026-10-18 10:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('github_client', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='GitHubSyncState',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('file_path', models.CharField(max_length=255, unique=True)),
+                ('blob_sha', models.CharField(max_length=40)),
+            ],
+            options={
+                'abstract': False,
+            },
+        ),
+    ]
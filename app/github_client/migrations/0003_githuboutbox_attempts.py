@@ -0,0 +1,23 @@
+# Generated by Django 2.2.24 on 2026-10-18 10:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('github_client', '0002_githubsyncstate'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='githuboutbox',
+            name='attempts',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='githuboutbox',
+            name='last_error',
+            field=models.TextField(blank=True, null=True),
+        ),
+    ]
@@ -0,0 +1,2 @@
+from .github_outbox import GitHubOutbox
+from .github_sync_state import GitHubSyncState
@@ -0,0 +1,70 @@
+# Django imports
+from django.conf import settings
+from django.db import models
+from django.db.models import F
+
+# Project imports
+from base.models import TimeStampedModel
+
+
+class GitHubOutbox(TimeStampedModel):
+    """
+    Change of the file in GitHub repo which is not pushed yet. Entries are written in the same
+    transaction as the change of the model, so the repo never misses a committed change,
+    and pushed in batches by github_client.tasks.push_github_outbox.
+
+    Several entries of the same file are coalesced, only the latest content is written.
+    Entries which GitHub rejected settings.GITHUB_OUTBOX_MAX_ATTEMPTS times are dead letters,
+    they are kept for inspection and not pushed anymore
+    """
+
+    file_path           = models.CharField(max_length=255)
+
+    # Content of the file at the moment of the change, None if the file is deleted
+    content             = models.TextField(null=True, blank=True)
+
+    # Failed pushes of the entry and the error of the last one
+    attempts            = models.PositiveIntegerField(default=0)
+    last_error          = models.TextField(null=True, blank=True)
+
+    @classmethod
+    def enqueue(cls, updates=(), deletes=()):
+        """
+        Records changes of models, must be called inside of the transaction which changes them
+
+        :param updates: models which files are created or updated
+        :param deletes: models which files are deleted, it must be called before the delete, while models have ids
+        :return:
+        """
+        from github_client.services import GitHubDB
+
+        gh = GitHubDB()
+        files = {gh.get_file_path(model): gh.get_json_content(model) for model in updates}
+        files.update({gh.get_file_path(model): None for model in deletes})
+
+        cls.enqueue_files(files)
+
+    @classmethod
+    def enqueue_files(cls, files):
+        """
+        :param files: dict {file_path: content or None to delete the file}
+        :return:
+        """
+        cls.objects.bulk_create([cls(file_path=file_path, content=content) for file_path, content in files.items()])
+
+    @classmethod
+    def pending(cls):
+        """
+        :return: entries which are not dead letters, in order of changes
+        """
+        return cls.objects.filter(attempts__lt=settings.GITHUB_OUTBOX_MAX_ATTEMPTS).order_by('id')
+
+    @classmethod
+    def record_failure(cls, entries, error):
+        """
+        :param entries: entries which push failed
+        :param error: the error of the push
+        :return:
+        """
+        cls.objects.filter(id__in=[entry.id for entry in entries]).update(attempts=F('attempts') + 1,
+                                                                         last_error=str(error))
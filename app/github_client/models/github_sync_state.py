@@ -0,0 +1,47 @@
+# Django imports
+from django.db import models, transaction
+
+# Project imports
+from base.models import TimeStampedModel
+
+# App imports
+from github_client.utils import git_blob_sha
+
+
+class GitHubSyncState(TimeStampedModel):
+    """
+    The last pushed state of the file in GitHub repo. Blob sha is the hash of the content,
+    so the content which is going to be written is compared with the stored state locally,
+    not changed files are skipped without requests to GitHub
+    """
+
+    file_path           = models.CharField(max_length=255, unique=True)
+
+    blob_sha            = models.CharField(max_length=40)
+
+    @classmethod
+    def stored_shas(cls, file_paths):
+        """
+        :param file_paths: list of paths
+        :return: dict {file_path: blob_sha} of files which were pushed
+        """
+        return dict(cls.objects.filter(file_path__in=list(file_paths)).values_list('file_path', 'blob_sha'))
+
+    @classmethod
+    def stored_sha(cls, file_path):
+        return cls.stored_shas([file_path]).get(file_path)
+
+    @classmethod
+    @transaction.atomic
+    def record(cls, files):
+        """
+        Stores state of pushed files
+
+        :param files: dict {file_path: content or None if the file is deleted}
+        :return:
+        """
+        cls.objects.filter(file_path__in=list(files)).delete()
+        cls.objects.bulk_create([
+            cls(file_path=file_path, blob_sha=git_blob_sha(content))
+            for file_path, content in files.items() if content is not None
+        ])
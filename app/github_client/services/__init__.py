@@ -1,2 +1,3 @@
 from .git_hub_eip import GitHubEIP
+from .git_mirror_eip import GitMirrorEIP
 from .git_hub_db import GitHubDB
\ No newline at end of file
@@ -1,106 +1,173 @@
 # Stdlib imports
-import base64
 import json
+import logging
 
 # Django imports
 from django.conf import settings
-from django.utils import timezone
-
-# Pip imports
-from github import Github
-from github.GithubException import UnknownObjectException
-from github import InputGitAuthor
+from django.core.management.color import no_style
+from django.db import connection
+from django.utils.module_loading import import_string
 
 # App imports
+from github_client.models import GitHubSyncState
+from github_client.utils import git_blob_sha
 
 
+logger = logging.getLogger(__name__)
 
-class GitHubDB:
-
-    gh = None
 
-    branch = settings.GITHUB_DB_BRANCH
+class GitHubDB:
+    """
+    Mirror of models in GitHub repo, every model is one JSON document addressed by its path (logical file).
+    Documents are grouped into files of the repo by the layout configured in settings.GITHUB_DB_LAYOUT
+    (see github_client.layouts) and stored by the backend configured in settings.GITHUB_DB_BACKEND
+    (see github_client.backends)
+    """
 
-    def __init__(self):
-        self.gh = Github(settings.GITHUB_USERNAME, settings.GITHUB_PASSWORD)
+    def __init__(self, backend=None, layout=None):
+        # Backend is created on first use, paths and contents of files are built without it
+        self._backend = backend
+        self.layout = layout or import_string(settings.GITHUB_DB_LAYOUT)()
 
-    def repo(self):
-        return self.gh.get_repo(settings.GITHUB_DB_REPO)
+    @property
+    def backend(self):
+        if self._backend is None:
+            self._backend = import_string(settings.GITHUB_DB_BACKEND)()
+        return self._backend
 
     def is_model_exists(self, model):
         """
-        Returns weather the model is already stored in the github repo
+        Returns weather the model is already stored in the github repo.
+        Files pushed by this app are known from the sync state without requests
         :param model:
         :return:
         """
         file_path = self.get_file_path(model)
-        try:
-            self.repo().get_contents(file_path, ref=self.branch)
-            return True
+        return GitHubSyncState.stored_sha(file_path) is not None or self.read_file(file_path) is not None
 
-        except UnknownObjectException as ex:
-            if ex.status == 404:
-                return False
-            raise
+    def read_file(self, file_path):
+        """
+        :param file_path:
+        :return: tuple (content, sha) or None if the file doesn't exist
+        """
+        return self.layout.read_file(self.backend, file_path)
 
 
     def create(self, model, author="Moderator"):
         """
-        see details https://pygithub.readthedocs.io/en/latest/github_objects/Repository.html?highlight=create_file
-
         :param model:
         :param author: The author of the commit
         :return:
         """
-        file_path = self.get_file_path(model)
-        json_content = self.get_json_content(model)
-
-        self.repo().create_file(path=file_path,
-                                message="Create new model ({})".format(type(model)),
-                                content=json_content,
-                                branch=self.branch,
-                                author=self.construct_author(author))
+        self.write_files({self.get_file_path(model): self.get_json_content(model)},
+                         message="Create new model ({})".format(type(model)),
+                         author=author)
 
     def update(self, model, author="Moderator"):
         """
-        see details https://pygithub.readthedocs.io/en/latest/github_objects/Repository.html?highlight=update_file
+        Not changed since the last push model is skipped without requests
 
         :param model:
         :param author: The author of the commit
         :return:
         """
-        file_path = self.get_file_path(model)
-        json_content = self.get_json_content(model)
-        contents = self.repo().get_contents(file_path, ref=self.branch)
-
-        if base64.b64decode(contents.content).decode('utf-8') == json_content:
-            return
-
-        # repo.update_file(contents.path, "more tests", "more tests", contents.sha, branch="test")
-        self.repo().update_file(path=file_path,
-                                message="Updated model ({})".format(type(model)),
-                                content=json_content,
-                                sha=contents.sha,
-                                branch=self.branch,
-                                author=self.construct_author(author))
+        self.write_files({self.get_file_path(model): self.get_json_content(model)},
+                         message="Updated model ({})".format(type(model)),
+                         author=author)
 
     def delete(self, model, author="Moderator"):
         """
-        see details https://pygithub.readthedocs.io/en/latest/github_objects/Repository.html?highlight=delete_file
-
         :param model:
         :param author: The author of the commit
         :return:
         """
-        file_path = self.get_file_path(model)
+        self.write_files({self.get_file_path(model): None},
+                         message="Deleted model ({})".format(type(model)),
+                         author=author)
+
+    def write_batch(self, updates=(), deletes=(), message=None, author="Moderator"):
+        """
+        Writes changes of many models with one commit
+
+        :param updates: models which files are created or updated
+        :param deletes: models which files are deleted
+        :param message: message of the commit
+        :param author: The author of the commit
+        :return: sha of the commit or None if nothing is changed
+        """
+        files = {self.get_file_path(model): self.get_json_content(model) for model in updates}
+        files.update({self.get_file_path(model): None for model in deletes})
+
+        message = message or "Updated {} and deleted {} models".format(len(updates), len(deletes))
+        return self.write_files(files, message, author=author)
+
+    def write_files(self, files, message, author="Moderator"):
+        """
+        Writes many files with one commit. Files which have the same content as the last pushed one
+        are skipped by comparing git blob sha computed locally with the sync state, without requests
+
+        :param files: dict {file_path: content or None to delete the file}
+        :param message: message of the commit
+        :param author: The author of the commit
+        :return: sha of the commit or None if nothing is changed
+        """
+        stored = GitHubSyncState.stored_shas(files)
+        files = {file_path: content for file_path, content in files.items()
+                 if content is None or stored.get(file_path) != git_blob_sha(content)}
+        if not files:
+            return None
+
+        # Only files of the repo which contain changed models are rewritten, they are built from the head
+        # which the commit is written on
+        commit_sha = self.backend.write_files(files, message, author, build=self.layout.build_files)
+        GitHubSyncState.record(files)
+
+        return commit_sha
+
+    def migrate_layout(self, folder, layout, author="Moderator"):
+        """
+        Moves models of the folder to files of other layout with one commit. Files of the current layout
+        are deleted, settings.GITHUB_DB_LAYOUT must be switched to the new layout after it.
+        Caller must hold github_client.tasks.WRITE_LOCK_KEY, so the outbox doesn't write files
+        of the old layout meanwhile
+
+        :param folder: name of the folder, e.g. stances
+        :param layout: new layout
+        :param author: The author of the commit
+        :return: tuple (amount of moved models, sha of the commit or None if nothing is changed)
+        """
+        documents = list(self.layout.iter_documents(self.backend, folder))
+
+        files = {file_path: None for file_path in self.list_layout_files(folder)}
+        files.update(layout.pack(documents))
 
-        contents = self.repo().get_contents(file_path, ref=self.branch)
+        commit_sha = self.backend.write_files(files, "Moved {} to {}".format(folder, type(layout).__name__), author)
+        return len(documents), commit_sha
 
-        self.repo().delete_file(path=contents.path,
-                                message="Create new model ({})".format(type(model)),
-                                sha=contents.sha,
-                                branch=self.branch,
-                                author=self.construct_author(author))
+    def reconcile(self, queryset, batch_size=None, author="Moderator"):
+        """
+        Finds files of the repo which don't match the models and rewrites only them. The repo is listed once,
+        expected blob shas are computed locally from the models, so requests scale with the amount of differences
+
+        :param queryset: all models of one GitHubCompatible class
+        :param batch_size: amount of files per commit
+        :param author: The author of the commit
+        :return: (int) amount of repaired files
+        """
+        folder = queryset.model().git_options().get('folder')
+        batch_size = batch_size or settings.GITHUB_RECONCILE_BATCH_SIZE
+
+        actual = self.list_layout_files(folder)
+        expected = self.layout.expected_shas(self.iter_documents(queryset.order_by('id')))
+
+        drifted = sorted(file_path for file_path in set(actual) | set(expected)
+                         if actual.get(file_path) != expected.get(file_path))
+
+        for position in range(0, len(drifted), batch_size):
+            self.repair_files(queryset, folder, drifted[position:position + batch_size], author)
+
+        logger.info("Reconciled {} files of {} with {} models".format(len(drifted), folder, len(expected)))
+        return len(drifted)
 
     def delete_repo_content(self, author="Moderator"):
         """
@@ -109,67 +176,79 @@ class GitHubDB:
         :param author: The author of the commit
         :return:
         """
-        contents = self.repo().get_contents("", ref=self.branch)
-
-        while len(contents) >= 1:
-            file_content = contents.pop(0)
-            if file_content.type == "dir":
-                contents.extend(self.repo().get_contents(file_content.path, ref=self.branch))
-            else:
-                self.repo().delete_file(path=file_content.path,
-                                        message="Delete repo content ({})".format(type(file_content.path)),
-                                        sha=file_content.sha,
-                                        branch=self.branch,
-                                        author=self.construct_author(author))
-
-    def retrive_from_github(self, default_eip_num):
-        import json
+        self.backend.write_files({file_path: None for file_path in self.backend.list_files()},
+                                 message="Delete repo content",
+                                 author=author)
+        GitHubSyncState.objects.all().delete()
+
+    def retrive_from_github(self, default_eip_num, batch_size=None):
+        """
+        Restores stances from the repo. Files are read in bulk (GitHub repo is downloaded as one tarball)
+        and stances are inserted by batches. Stances which already exist are skipped, so the interrupted restore
+        continues from where it stopped when it is run again
+
+        :param default_eip_num: EIP of stances which files don't have eip_num
+        :param batch_size: amount of stances per insert
+        :return: (int) amount of restored stances
+        """
+        from stance.models import Stance
+
+        files = self.layout.iter_documents(self.backend, Stance().git_options().get('folder'))
+        return self.restore_stances(files, default_eip_num, batch_size or settings.GITHUB_RESTORE_BATCH_SIZE)
+
+    def restore_stances(self, files, default_eip_num, batch_size):
+        """
+        :param files: iterable of tuples (logical file_path, content) of stances
+        :param default_eip_num: EIP of stances which files don't have eip_num
+        :param batch_size: amount of stances per insert
+        :return: (int) amount of restored stances
+        """
         from stance.models import Stance
         from influencer.models import Influencer
         from eip.models import EIP
 
-        contents = self.repo().get_contents("", ref=self.branch)
+        # Everything which is needed to build stances is loaded with 3 queries
+        eip_ids = dict(EIP.objects.values_list('eip_num', 'id'))
+        influencer_ids = dict(Influencer.objects.values_list('screen_name', 'id'))
+        existing_ids = set(Stance.objects.values_list('id', flat=True))
+
+        restored = 0
+        stances = []
+        files_state = {}
 
-        while len(contents) >= 1:
-            print("LENGTH: {}".format(len(contents)))
+        def flush():
+            # Restored files are the pushed state of the repo
+            Stance.objects.bulk_create(stances, ignore_conflicts=True)
+            GitHubSyncState.record(files_state)
+            stances.clear()
+            files_state.clear()
 
-            file_content = contents.pop(0)
-            if file_content.type == "dir":
-                contents.extend(self.repo().get_contents(file_content.path, ref=self.branch))
-            else:
-                content = json.loads(base64.b64decode(file_content.content).decode('utf-8'))
+        for file_path, file_content in files:
+            content = json.loads(file_content)
+            if content.get("id") in existing_ids:
+                continue
 
-                id_obj = content.get("id")
-                author = content.get("author")
-                author_from_social = content.get("author_from_social")
-                proof_url = content.get("proof_url")
-                choice = content.get("choice").get("key")
-                status = content.get("status").get("key")
-                influencer = content.get("influencer")
-                created_at = content.get("created_at")
+            stance = self.construct_stance(content, default_eip_num, eip_ids, influencer_ids)
+            if stance is None:
+                continue
 
-                eip_num = content.get("eip_num", default_eip_num)
+            stances.append(stance)
+            files_state[file_path] = file_content
+            restored += 1
 
-                params = {
-                    "id": id_obj,
-                    "author": author,
-                    "proof_url": proof_url,
-                    "choice": choice,
-                    "status": status,
-                    "created_at": created_at,
-                    "eip": EIP.objects.get(eip_num=eip_num)
-                }
+            if len(stances) >= batch_size:
+                flush()
 
-                if influencer:
-                    try:
-                        params["influencer"] = Influencer.objects.get(screen_name=influencer.get("screen_name"))
-                    except Influencer.DoesNotExist:
-                        print("Influencer no more exists: {}".format(params))
+        if stances:
+            flush()
 
-                if author_from_social:
-                    params["author_from_social"] = author_from_social
+        # Ids are restored explicitly, so the sequence is moved after them
+        with connection.cursor() as cursor:
+            for sql in connection.ops.sequence_reset_sql(no_style(), [Stance]):
+                cursor.execute(sql)
 
-                Stance.objects.create(**params)
+        logger.info("Restored {} stances from GitHub".format(restored))
+        return restored
 
 
     """
@@ -178,7 +257,7 @@ class GitHubDB:
 
     def get_file_path(self, model):
         """
-        Generates path to file for specific model. Must implement abstract GitHubCompatible
+        Generates path to file (logical, see layouts) for specific model. Must implement abstract GitHubCompatible
         :param model:
         :return:
         """
@@ -186,8 +265,9 @@ class GitHubDB:
         return '{}/{}.json'.format(options.get('folder'), model.id)
 
     def get_json_content(self, model):
+        # Keys are sorted, so the same data always gives the same content and blob sha
         Serializer = model.git_options().get('serializer')
-        return json.dumps(Serializer(instance=model).data)
+        return json.dumps(Serializer(instance=model).data, sort_keys=True)
 
     def get_json_content_from_repo(self, model):
         """
@@ -195,17 +275,99 @@ class GitHubDB:
         :param model:
         :return:
         """
-        file_path = self.get_file_path(model)
-        contents = self.repo().get_contents(file_path, ref=self.branch)
+        content, sha = self.read_file(self.get_file_path(model))
 
-        return base64.b64decode(contents.content).decode('utf-8')
+        return content
 
-    def construct_author(self, name, email='unknown@example.com', date=str(timezone.now())):
-        return InputGitAuthor(name, email, date)
+    def iter_documents(self, queryset):
+        """
+        :param queryset: models
+        :return: generator of tuples (logical file_path, content)
+        """
+        for model in queryset.iterator():
+            yield self.get_file_path(model), self.get_json_content(model)
 
+    def list_layout_files(self, folder):
+        """
+        Files of the folder which store models in the current layout. Other files with the same extension
+        (e.g. index.json added by hand) are skipped with a warning, they are never rewritten or deleted
 
+        :param folder: name of the folder, e.g. stances
+        :return: dict {file_path: blob sha}
+        """
+        files = {}
+        for file_path, sha in self.backend.list_files().items():
+            if not file_path.startswith(folder + '/'):
+                continue
 
+            if self.layout.is_layout_file(file_path):
+                files[file_path] = sha
+            elif file_path.endswith(self.layout.extension):
+                logger.warning("File '{}' is not a file of models, it is skipped".format(file_path))
 
+        return files
 
+    def repair_files(self, queryset, folder, file_paths, author):
+        """
+        Rewrites files of the repo from the models with one commit, files without models are deleted
 
+        :param queryset: all models of one GitHubCompatible class
+        :param folder: name of the folder of models
+        :param file_paths: paths of files of the repo
+        :param author: The author of the commit
+        :return:
+        """
+        files = {}
+        documents = {}
+        for file_path in file_paths:
+            first_id, last_id = self.layout.id_range(file_path)
+            models_documents = list(self.iter_documents(queryset.filter(id__gte=first_id, id__lte=last_id)
+                                                        .order_by('id')))
+
+            files[file_path] = self.layout.pack(models_documents).get(file_path)
+
+            # Sync state of models of the file is replaced with the written state
+            documents.update({self.layout.document_path(folder, model_id): None
+                              for model_id in range(first_id, last_id + 1)})
+            documents.update(models_documents)
+
+        self.backend.write_files(files, "Reconciled {} files".format(len(files)), author)
+        GitHubSyncState.record(documents)
+
+    def construct_stance(self, content, default_eip_num, eip_ids, influencer_ids):
+        """
+        Builds Stance (not saved) from the content of its file
+
+        :param content: parsed JSON of the file
+        :param default_eip_num: EIP of stances which files don't have eip_num
+        :param eip_ids: dict {eip_num: id}
+        :param influencer_ids: dict {screen_name: id}
+        :return: (Stance) or None if its EIP doesn't exist
+        """
+        from stance.models import Stance
 
+        eip_num = str(content.get("eip_num", default_eip_num))
+        if eip_num not in eip_ids:
+            logger.warning("EIP {} of Stance with id '{}' doesn't exist".format(eip_num, content.get("id")))
+            return None
+
+        params = {
+            "id": content.get("id"),
+            "author": content.get("author"),
+            "proof_url": content.get("proof_url"),
+            "choice": content.get("choice").get("key"),
+            "status": content.get("status").get("key"),
+            "created_at": content.get("created_at"),
+            "eip_id": eip_ids[eip_num],
+        }
+
+        influencer = content.get("influencer")
+        if influencer:
+            params["influencer_id"] = influencer_ids.get(influencer.get("screen_name"))
+            if params["influencer_id"] is None:
+                logger.warning("Influencer no more exists: {}".format(params))
+
+        if content.get("author_from_social"):
+            params["author_from_social"] = content.get("author_from_social")
+
+        return Stance(**params)
@@ -1,5 +1,7 @@
 # Stdlib imports
-import base64
+import logging
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
 
 # Django imports
 from django.conf import settings
@@ -8,55 +10,127 @@ from django.conf import settings
 from github import Github
 
 # App imports
-from eip.models import EIP
-from github_client.utils import parse_eip_details
+from github_client.utils import build_eip
+from .github_session import GitHubSession
 
 
-class GitHubEIP:
+logger = logging.getLogger(__name__)
 
-    gh = None
 
-    def __init__(self):
-        self.gh = Github(settings.GITHUB_USERNAME, settings.GITHUB_PASSWORD)
+"""
+Light representation of the EIP file in the repo, built from the git tree
+"""
+EIPFile = namedtuple('EIPFile', ['name', 'path', 'sha', 'download_url'])
 
-    def repo(self):
-        return self.gh.get_repo("ethereum/EIPs")
+RAW_CONTENT_URL = 'https://raw.githubusercontent.com/{repo}/{branch}/{path}'
 
-    def content_of_dir(self, path=""):
-        return self.repo().get_contents(path)
 
-    def eips_list(self):
-        return self.content_of_dir('/EIPS')
+class GitHubEIP:
 
-    def load_eip(self, content_eip_file):
-        b64_content = content_eip_file.content
+    gh = None
 
-        file_name = content_eip_file.name
-        file_download_url = content_eip_file.download_url
-        file_sha = content_eip_file.sha
-        file_content = base64.b64decode(b64_content).decode('utf-8')
+    repo_name = "ethereum/EIPs"
 
-        eip, title, status, eip_type, category, authors, created_raw, created = parse_eip_details(file_content)
+    branch = "master"
 
-        eip_dict = {
-            'eip_num':          eip,
-            'eip_title':        title,
-            'eip_status':       status,
-            'eip_type':         eip_type,
-            'eip_category':     category,
-            'eip_authors':      authors,
-            'eip_created_raw':  created_raw,
-            'eip_created':      created,
+    eips_folder = "EIPS"
 
-            'file_name':            file_name,
-            'file_download_url':    file_download_url,
-            'file_content':         file_content,
-            'file_sha':             file_sha,
-        }
+    concurrency = None
 
-        return EIP(**eip_dict)
+    def __init__(self, concurrency=None):
+        self.gh = Github(settings.GITHUB_USERNAME, settings.GITHUB_PASSWORD)
+        self.concurrency = concurrency or settings.GITHUB_FETCH_CONCURRENCY
+        self.session = GitHubSession(pool_size=self.concurrency)
 
+        # Repo handle is loaded once per instance
+        self._repo = None
 
+        # Prefetched contents of blobs by sha
+        self.blobs = {}
 
+    def repo(self):
+        if self._repo is None:
+            self._repo = self.gh.get_repo(self.repo_name)
+        return self._repo
 
+    def content_of_dir(self, path=""):
+        return self.repo().get_contents(path)
 
+    def eips_list(self):
+        """
+        Returns EIP files of the EIPS folder loaded with one (conditional) request of its git tree.
+        Every file contains only name and blob sha, the content is loaded in load_eip.
+
+        EIPs are stored by file name, so only files of the folder itself are listed (not of subfolders,
+        where names can repeat). Listing which GitHub truncated raises, otherwise missing files would be synced
+        as deleted EIPs
+
+        :return: list of EIPFile
+        """
+        tree = self.session.get_json('/repos/{}/git/trees/{}:{}'.format(self.repo_name, self.branch, self.eips_folder))
+
+        if tree.get('truncated'):
+            raise ValueError("Git tree of '{}' folder is truncated by GitHub".format(self.eips_folder))
+
+        return [self.construct_eip_file(element['path'], element['sha'])
+                for element in tree['tree'] if element['type'] == "blob"]
+
+    def prefetch(self, eip_files):
+        """
+        Loads contents of EIP files in parallel with bounded amount of threads.
+        Files which can't be loaded are skipped here, load_eip will request them again
+
+        :param eip_files: list of EIPFile
+        :return:
+        """
+        shas = [eip_file.sha for eip_file in eip_files if eip_file.sha not in self.blobs]
+
+        def fetch(sha):
+            try:
+                return sha, self.fetch_blob(sha)
+            except Exception as ex:
+                logger.warning("Can't prefetch blob '{}', error occurred: '{}'".format(sha, ex))
+                return sha, None
+
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            for sha, content in executor.map(fetch, shas):
+                if content is not None:
+                    self.blobs[sha] = content
+
+    def load_eip(self, eip_file):
+        """
+        Takes prefetched content of the EIP file or loads it by the blob sha and parse it into EIP model (not saved)
+
+        :param eip_file: (EIPFile)
+        :return: (EIP)
+        """
+        file_content = self.blobs.pop(eip_file.sha, None)
+        if file_content is None:
+            file_content = self.fetch_blob(eip_file.sha)
+
+        return build_eip(eip_file.name, eip_file.download_url, eip_file.sha, file_content)
+
+
+    """
+    Utils / Helpers
+    """
+
+    def fetch_blob(self, sha):
+        """
+        Loads raw content of the blob through the shared session. Blob is addressed by its content,
+        so the cached blob is never requested again
+        """
+        content = self.session.get('/repos/{}/git/blobs/{}'.format(self.repo_name, sha),
+                                   headers={'Accept': 'application/vnd.github.v3.raw'},
+                                   immutable=True)
+
+        return content.decode('utf-8')
+
+    def construct_eip_file(self, tree_path, sha):
+        path = '{}/{}'.format(self.eips_folder, tree_path)
+        download_url = RAW_CONTENT_URL.format(repo=self.repo_name, branch=self.branch, path=path)
+
+        return EIPFile(name=tree_path.split('/')[-1],
+                       path=path,
+                       sha=sha,
+                       download_url=download_url)
@@ -0,0 +1,114 @@
+# Stdlib imports
+import os
+
+# Django imports
+from django.conf import settings
+
+# App imports
+from github_client.git_command import parse_cat_file_batch
+from github_client.git_command import parse_ls_tree
+from github_client.git_command import run_git
+from github_client.utils import build_eip
+from .git_hub_eip import EIPFile
+from .git_hub_eip import RAW_CONTENT_URL
+
+
+class GitMirrorEIP:
+    """
+    Reads EIPs from the local bare clone of the official repo instead of GitHub API.
+    The clone is created on first use and updated with one fetch on every eips_list call,
+    blobs are read straight from the local object store.
+
+    Has the same interface as GitHubEIP
+    """
+
+    repo_url = None
+
+    mirror_path = None
+
+    repo_name = "ethereum/EIPs"
+
+    branch = "master"
+
+    eips_folder = "EIPS"
+
+    def __init__(self, repo_url=None, mirror_path=None):
+        self.repo_url = repo_url or settings.EIPS_MIRROR_REPO_URL
+        self.mirror_path = mirror_path or settings.EIPS_MIRROR_PATH
+
+        # Prefetched contents of blobs by sha
+        self.blobs = {}
+
+    def update(self):
+        """
+        Clones the repo if mirror doesn't exist yet, otherwise fetches new commits of the branch
+        :return:
+        """
+        if not os.path.isdir(self.mirror_path):
+            self.git('clone', '--bare', '--single-branch', '--branch', self.branch, self.repo_url, self.mirror_path,
+                     in_mirror=False)
+            return
+
+        self.git('fetch', '--prune', self.repo_url, '+refs/heads/{0}:refs/heads/{0}'.format(self.branch))
+
+    def eips_list(self):
+        """
+        Updates the mirror and returns EIP files of the EIPS folder, files of subfolders are skipped as in GitHubEIP
+
+        :return: list of EIPFile
+        """
+        self.update()
+
+        output = self.git('ls-tree', '-z', '{}:{}'.format(self.branch, self.eips_folder))
+
+        return [self.construct_eip_file(path, sha) for path, sha in parse_ls_tree(output)]
+
+    def prefetch(self, eip_files):
+        """
+        Reads contents of EIP files with one git process
+
+        :param eip_files: list of EIPFile
+        :return:
+        """
+        shas = [eip_file.sha for eip_file in eip_files if eip_file.sha not in self.blobs]
+        if len(shas) == 0:
+            return
+
+        output = self.git('cat-file', '--batch', input='\n'.join(shas).encode('utf-8') + b'\n')
+
+        for sha, content in parse_cat_file_batch(output).items():
+            # Not decodable blobs are skipped here, load_eip will raise the error for them
+            try:
+                self.blobs[sha] = content.decode('utf-8')
+            except UnicodeDecodeError:
+                continue
+
+    def load_eip(self, eip_file):
+        """
+        Takes prefetched content of the EIP file or reads it from the mirror and parse it into EIP model (not saved)
+
+        :param eip_file: (EIPFile)
+        :return: (EIP)
+        """
+        file_content = self.blobs.pop(eip_file.sha, None)
+        if file_content is None:
+            file_content = self.git('cat-file', 'blob', eip_file.sha).decode('utf-8')
+
+        return build_eip(eip_file.name, eip_file.download_url, eip_file.sha, file_content)
+
+
+    """
+    Utils / Helpers
+    """
+
+    def git(self, *args, in_mirror=True, input=None):
+        return run_git(*args, git_dir=self.mirror_path if in_mirror else None, input=input)
+
+    def construct_eip_file(self, tree_path, sha):
+        path = '{}/{}'.format(self.eips_folder, tree_path)
+        download_url = RAW_CONTENT_URL.format(repo=self.repo_name, branch=self.branch, path=path)
+
+        return EIPFile(name=tree_path.split('/')[-1],
+                       path=path,
+                       sha=sha,
+                       download_url=download_url)
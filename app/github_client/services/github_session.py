@@ -0,0 +1,159 @@
+# Stdlib imports
+import hashlib
+import json
+import logging
+
+# Django imports
+from django.conf import settings
+
+# Pip imports
+import redis
+import requests
+from prometheus_client import Counter
+from requests.adapters import HTTPAdapter
+
+# Project imports
+from base.redis_client import get_redis
+
+
+logger = logging.getLogger(__name__)
+
+GITHUB_CACHE_HITS = Counter('github_cache_hits_total',
+                            'GitHub responses served from the cache (304 or immutable content)')
+GITHUB_CACHE_MISSES = Counter('github_cache_misses_total',
+                              'GitHub responses loaded from API')
+
+
+class GitHubSession:
+    """
+    Keep-alive session to GitHub REST API. Connections are pooled, so one session
+    can be shared between threads which load data concurrently.
+
+    Responses are cached in redis by url. Cached responses are revalidated with
+    If-None-Match / If-Modified-Since, GitHub answers 304 without counting it in rate limit
+    """
+
+    api_url = 'https://api.github.com'
+
+    timeout = 30
+
+    cache_prefix = 'github:response:'
+
+    session = None
+
+    def __init__(self, pool_size=10, use_cache=None):
+        self.session = requests.Session()
+        if settings.GITHUB_USERNAME:
+            self.session.auth = (settings.GITHUB_USERNAME, settings.GITHUB_PASSWORD)
+
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=3)
+        self.session.mount('https://', adapter)
+
+        self.use_cache = settings.GITHUB_CACHE_ENABLED if use_cache is None else use_cache
+
+    def get(self, path, params=None, headers=None, immutable=False):
+        """
+        :param path: path of API endpoint, e.g. /repos/ethereum/EIPs
+        :param params: query params
+        :param headers: additional headers
+        :param immutable: content of url never changes (e.g. blob by sha), cached content is returned without request
+        :return: (bytes) content of response
+        """
+        url = self.api_url + path
+        request_headers = dict(headers or {})
+        cache_key = self.construct_cache_key(url, params, request_headers)
+        cached = self.cache_get(cache_key)
+
+        if cached and immutable:
+            GITHUB_CACHE_HITS.inc()
+            return cached[b'content']
+
+        if cached and cached.get(b'etag'):
+            request_headers['If-None-Match'] = cached[b'etag'].decode('utf-8')
+        if cached and cached.get(b'last_modified'):
+            request_headers['If-Modified-Since'] = cached[b'last_modified'].decode('utf-8')
+
+        response = self.session.get(url, params=params, headers=request_headers, timeout=self.timeout)
+
+        if response.status_code == 304 and cached:
+            GITHUB_CACHE_HITS.inc()
+            return cached[b'content']
+
+        response.raise_for_status()
+        GITHUB_CACHE_MISSES.inc()
+
+        etag = response.headers.get('ETag')
+        last_modified = response.headers.get('Last-Modified')
+        if immutable or etag or last_modified:
+            self.cache_set(cache_key, {
+                'etag': etag or '',
+                'last_modified': last_modified or '',
+                'content': response.content,
+            })
+
+        return response.content
+
+    def get_json(self, path, params=None, headers=None, immutable=False):
+        return json.loads(self.get(path, params=params, headers=headers, immutable=immutable).decode('utf-8'))
+
+    def request(self, method, path, data=None, params=None, headers=None):
+        """
+        Not cached request, for writes and reads of moving refs, trees and files of commits which are read once
+
+        :param method: HTTP method, e.g. POST
+        :param path: path of API endpoint
+        :param data: body of request, sent as JSON
+        :param params: query params
+        :param headers: additional headers
+        :return: (bytes) content of response
+        """
+        response = self.session.request(method, self.api_url + path, json=data, params=params, headers=headers,
+                                        timeout=self.timeout)
+        response.raise_for_status()
+        return response.content
+
+    def request_json(self, method, path, data=None, params=None):
+        return json.loads(self.request(method, path, data=data, params=params).decode('utf-8'))
+
+    def open_stream(self, path):
+        """
+        Not cached request which content is read while it is downloaded, e.g. archive of the repo.
+        Response must be closed by the caller
+
+        :param path: path of API endpoint
+        :return: (requests.Response)
+        """
+        response = self.session.get(self.api_url + path, stream=True, timeout=self.timeout)
+        response.raise_for_status()
+        return response
+
+
+    """
+    Utils / Helpers
+    """
+
+    def construct_cache_key(self, url, params, headers):
+        raw_key = '{}|{}|{}'.format(url, sorted((params or {}).items()), headers.get('Accept', ''))
+        return self.cache_prefix + hashlib.sha1(raw_key.encode('utf-8')).hexdigest()
+
+    def cache_get(self, cache_key):
+        if not self.use_cache:
+            return None
+
+        try:
+            return get_redis().hgetall(cache_key) or None
+        except redis.RedisError as ex:
+            logger.warning("Can't read GitHub response cache, error occurred: '{}'".format(ex))
+            return None
+
+    def cache_set(self, cache_key, value):
+        if not self.use_cache:
+            return
+
+        try:
+            pipe = get_redis().pipeline()
+            pipe.hmset(cache_key, value)
+            pipe.expire(cache_key, settings.GITHUB_CACHE_TIMEOUT)
+            pipe.execute()
+        except redis.RedisError as ex:
+            logger.warning("Can't write GitHub response cache, error occurred: '{}'".format(ex))
@@ -0,0 +1,165 @@
+# Stdlib imports
+import logging
+import operator
+import time
+from functools import reduce
+
+# Django imports
+from django.conf import settings
+from django.db.models import Q
+
+# Pip imports
+from celery import task
+from redis.exceptions import LockError
+
+# Project imports
+from base.redis_client import get_redis
+from stance.models import Stance
+
+# App imports
+from .models import GitHubOutbox
+from .services import GitHubDB
+
+
+logger = logging.getLogger(__name__)
+
+
+# Tasks which write to the repo hold the lock, so files are never written concurrently
+WRITE_LOCK_KEY = 'github:outbox:lock'
+
+
+@task()
+def push_github_outbox():
+    """
+    Pushes changes recorded in the outbox to GitHub repo, one commit per batch. Entries of the same file
+    are coalesced into one write of the latest content. Only one task pushes at a time,
+    so changes of the same file are never written out of order.
+
+    One run writes at most settings.GITHUB_OUTBOX_MAX_WRITES commits and extends the lock after each of them.
+    The batch which GitHub rejects is split in halves until rejected files are found, other files are pushed,
+    so one broken file doesn't block the outbox
+
+    :return:
+    """
+    lock = get_redis().lock(WRITE_LOCK_KEY, timeout=settings.GITHUB_OUTBOX_LOCK_TIMEOUT)
+    if not lock.acquire(blocking=False):
+        return
+
+    try:
+        gh = GitHubDB()
+        writes = 0
+        failed_ids = []
+        extended_at = time.monotonic()
+
+        while writes < settings.GITHUB_OUTBOX_MAX_WRITES:
+            # Entries which failed in this run are tried again by the next one
+            entries = list(GitHubOutbox.pending().exclude(id__in=failed_ids)[:settings.GITHUB_OUTBOX_BATCH_SIZE])
+            if not entries:
+                return
+
+            batches = [entries]
+            while batches and writes < settings.GITHUB_OUTBOX_MAX_WRITES:
+                batch = batches.pop(0)
+                writes += 1
+
+                error = push_outbox_entries(gh, batch)
+                file_paths = list(dict.fromkeys(entry.file_path for entry in batch))
+
+                if error is not None and len(file_paths) > 1:
+                    # Halves are pushed separately to find files which GitHub rejects, entries of a file stay together
+                    first_half = set(file_paths[:len(file_paths) // 2])
+                    batches[:0] = [[entry for entry in batch if entry.file_path in first_half],
+                                   [entry for entry in batch if entry.file_path not in first_half]]
+
+                elif error is not None:
+                    record_outbox_failure(batch, error)
+                    failed_ids.extend(entry.id for entry in batch)
+
+                # The lock is renewed to the whole timeout after every write
+                lock.extend(time.monotonic() - extended_at)
+                extended_at = time.monotonic()
+
+    except LockError as ex:
+        logger.error("Lock of GitHub outbox is lost, the push is stopped: '{}'".format(ex))
+    finally:
+        release_lock(lock)
+
+
+@task()
+def push_github_db():
+    """
+    Publishes commits of the backend which writes locally (see settings.GITHUB_DB_BACKEND) to GitHub repo
+
+    :return:
+    """
+    try:
+        GitHubDB().backend.push()
+    except Exception as ex:
+        logger.error("Can't push GitHubDB to GitHub, cause the error occurred: '{}'".format(ex))
+
+
+@task()
+def reconcile_github_db():
+    """
+    Finds stances which files in GitHub repo differ from the db (e.g. lost writes or edits made
+    in the repo by hand) and rewrites only these files
+
+    :return:
+    """
+    lock = get_redis().lock(WRITE_LOCK_KEY, timeout=settings.GITHUB_OUTBOX_LOCK_TIMEOUT)
+    if not lock.acquire(blocking=False):
+        return
+
+    try:
+        GitHubDB().reconcile(Stance.objects.select_related('influencer'))
+    except Exception as ex:
+        logger.error("Can't reconcile GitHubDB, cause the error occurred: '{}'".format(ex))
+    finally:
+        release_lock(lock)
+
+
+def push_outbox_entries(gh, entries):
+    """
+    Writes entries with one commit and removes them from the outbox
+
+    :param gh: (GitHubDB)
+    :param entries: list of GitHubOutbox ordered by id
+    :return: None if entries are pushed or the error of the write
+    """
+    # Entries are ordered, so the latest content of the file wins
+    files = {entry.file_path: entry.content for entry in entries}
+
+    try:
+        gh.write_files(files, "Updated {} files".format(len(files)))
+    except Exception as ex:
+        logger.error("Can't push {} files to GitHub, cause the error occurred: '{}'".format(len(files), ex))
+        return ex
+
+    # Older entries of pushed files (e.g. which failed before) are outdated by the pushed content
+    latest_ids = {entry.file_path: entry.id for entry in entries}
+    GitHubOutbox.objects.filter(reduce(operator.or_, [
+        Q(file_path=file_path, id__lte=latest_id) for file_path, latest_id in latest_ids.items()
+    ])).delete()
+    return None
+
+
+def record_outbox_failure(entries, error):
+    """
+    Entries of one file are kept and pushed by next runs until they are dead letters
+
+    :param entries: list of GitHubOutbox of one file
+    :param error: the error of the write
+    :return:
+    """
+    GitHubOutbox.record_failure(entries, error)
+
+    if max(entry.attempts for entry in entries) + 1 >= settings.GITHUB_OUTBOX_MAX_ATTEMPTS:
+        logger.error("File '{}' is not pushed to GitHub anymore, its outbox entries are dead letters".format(
+            entries[0].file_path))
+
+
+def release_lock(lock):
+    try:
+        lock.release()
+    except LockError:
+        logger.warning("Lock '{}' is expired before it was released".format(WRITE_LOCK_KEY))
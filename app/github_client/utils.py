@@ -1,94 +1,236 @@
 # Stdlib imports
-import io
+import hashlib
+import json
+import logging
 from datetime import datetime
 
+# Django imports
+from django.conf import settings
+
+# Pip imports
+import redis
+
+# Project imports
+from base.redis_client import get_redis
+
 # App imports
 from eip.models import EIP
 
 
-def parse_eip_details(content):
-    is_start_found = False
-    is_finish_found = False
-    eip_type = EIP.OTHER
-    status = EIP.OTHER
-    eip = category = title = authors = created = None
-
-    # make iterable sting
-    buff = io.StringIO(content)
-
-    while buff.readable() and not is_finish_found:
-        line = buff.readline()
-        line_lower = line.lower()
-        line = line.replace(' \n', '')
-        line = line.replace('\n', '')
-
-        if line == '' or not line:
-            raise Exception("Not found variables but the end of the content was reached")
-
-        if not is_start_found and '---' in line:
-            is_start_found = True
+logger = logging.getLogger(__name__)
+
+
+# Delimiter of the front matter block at the beginning of EIP file
+PREAMBLE_DELIMITER = '---'
+
+# Headers which values are comma separated lists of EIP numbers
+PREAMBLE_LIST_HEADERS = ('requires', 'replaces', 'superseded-by')
+
+# Known values of headers, checked in order when the value has extra words, e.g. "Final (Living)"
+STATUSES = (
+    ('draft', EIP.DRAFT),
+    ('active', EIP.ACTIVE),
+    ('last call', EIP.LAST_CALL),
+    ('replaced', EIP.REPLACED),
+    ('superseded', EIP.REPLACED),
+    ('accepted', EIP.ACCEPTED),
+    ('final', EIP.FINAL),
+    ('deferred', EIP.DEFERRED),
+)
+
+TYPES = (
+    ('standards track', EIP.STANDARDS_TRACK),
+    ('standard track', EIP.STANDARDS_TRACK),
+    ('informational', EIP.INFORMATIONAL),
+    ('meta', EIP.META),
+)
+
+CATEGORIES = (
+    ('core', EIP.CORE),
+    ('networking', EIP.NETWORKING),
+    ('interface', EIP.INTERFACE),
+    ('erc', EIP.ERC),
+)
+
+
+def parse_eip_preamble(content):
+    """
+    Parses the front matter block of EIP file with one pass over its lines.
+
+    Header names are lower cased. Indented lines continue the value of previous header,
+    values of 'requires', 'replaces' and 'superseded-by' are returned as lists
+
+    :param content: (str) content of EIP file
+    :return: dict {header: value}
+    """
+    start = content.find(PREAMBLE_DELIMITER)
+    if start == -1 or content[:start].strip(' \t\r\n\ufeff'):
+        raise ValueError("Preamble is not found at the beginning of the content")
+
+    block_start = content.find('\n', start) + 1
+    block_end = content.find('\n' + PREAMBLE_DELIMITER, block_start - 1)
+    if block_start == 0 or block_end == -1:
+        raise ValueError("End of preamble is not found")
+
+    headers = {}
+    header = None
+
+    for line in content[block_start:block_end].split('\n'):
+        if not line.strip():
+            continue
+
+        # Multi-line value
+        if line[0] in ' \t' and header is not None:
+            headers[header] = '{} {}'.format(headers[header], line.strip()).strip()
             continue
 
-        if is_start_found and '---' in line:
-            is_finish_found = True
-
-
-        if "eip: " in line_lower:
-            eip = line.replace('eip: ', '')
-
-        if "title: " in line_lower:
-            title = line.replace('title: ', '')
-
-        if "status: " in line_lower:
-            if 'draft' in line_lower:
-                status = EIP.DRAFT
-            elif 'active' in line_lower:
-                status = EIP.ACTIVE
-            elif 'last call' in line_lower:
-                status = EIP.LAST_CALL
-            elif 'replaced' or 'superseded' in line_lower:
-                status = EIP.REPLACED
-            elif 'accepted' in line_lower:
-                status = EIP.ACCEPTED
-            elif 'final' in line_lower:
-                status = EIP.FINAL
-            elif 'deferred' in line_lower:
-                status = EIP.DEFERRED
-
-        if "type: " in line_lower:
-            if 'standards track' in line_lower:
-                eip_type = EIP.STANDARDS_TRACK
-            elif 'informational' in line_lower:
-                eip_type = EIP.INFORMATIONAL
-            elif 'meta' in line_lower:
-                eip_type = EIP.META
-
-        if "category: " in line_lower:
-            if 'core' in line:
-                category = EIP.CORE
-            elif 'networking' in line_lower:
-                category = EIP.NETWORKING
-            elif 'interface' in line_lower:
-                category = EIP.INTERFACE
-            elif 'erc' in line_lower:
-                category = EIP.ERC
-
-        if "author: " in line_lower:
-            authors = line.replace('author: ', '')
-
-        if "authors: " in line_lower:
-            authors = line.replace('authors: ', '')
-
-        if "created: " in line_lower:
-            created_raw = line.replace('created: ', '')
-            created = parse_created_date(created_raw)
+        name, separator, value = line.partition(':')
+        if not separator:
+            continue
+
+        header = name.strip().lower()
+        headers[header] = value.strip()
+
+    for header, value in headers.items():
+        if len(value) > 1 and value[0] == value[-1] and value[0] in '"\'':
+            headers[header] = value[1:-1]
+
+    for header in PREAMBLE_LIST_HEADERS:
+        if header in headers:
+            headers[header] = [item.strip() for item in headers[header].split(',') if item.strip()]
+
+    return headers
+
+
+def match_choice(value, choices, default=None):
+    """
+    Maps value of header to the choice of EIP model, exact match is checked before partial one
+
+    :param value: (str) value of header
+    :param choices: tuple of pairs (known value, choice)
+    :param default: returned if value is not recognized
+    :return:
+    """
+    if not value:
+        return default
+
+    value = value.lower()
+    for known_value, choice in choices:
+        if value == known_value:
+            return choice
+
+    for known_value, choice in choices:
+        if known_value in value:
+            return choice
+
+    return default
+
+
+def parse_eip_details(content):
+    headers = parse_eip_preamble(content)
+
+    eip = headers.get('eip')
+    title = headers.get('title')
+    status = match_choice(headers.get('status'), STATUSES, EIP.OTHER)
+    eip_type = match_choice(headers.get('type'), TYPES, EIP.OTHER)
+    category = match_choice(headers.get('category'), CATEGORIES)
+    authors = headers.get('author') or headers.get('authors')
+    created_raw = headers.get('created')
+    created = parse_created_date(created_raw) if created_raw else None
 
     return eip, title, status, eip_type, category, authors, created_raw, created
 
 
+# Must be increased when the parser changes its results, so cached results are not used anymore
+PARSER_VERSION = 1
+
+PARSE_CACHE_PREFIX = 'eip:details:v{}:'.format(PARSER_VERSION)
+
+
+def parse_eip_details_cached(file_sha, file_content):
+    """
+    Parsed details are cached in redis by git blob sha, so the same content is never parsed twice,
+    e.g. on resync after restore of db or on new environment
+
+    :param file_sha: git blob sha of the content
+    :param file_content: (str) content of EIP file
+    :return: the same tuple as parse_eip_details
+    """
+    if not settings.EIP_PARSE_CACHE_ENABLED or not file_sha:
+        return parse_eip_details(file_content)
+
+    cache_key = PARSE_CACHE_PREFIX + file_sha
+
+    try:
+        cached = get_redis().get(cache_key)
+    except redis.RedisError as ex:
+        logger.warning("Can't read EIP parse cache, error occurred: '{}'".format(ex))
+        cached = None
+
+    if cached:
+        eip, title, status, eip_type, category, authors, created_raw, created = json.loads(cached.decode('utf-8'))
+        created = datetime.strptime(created, "%Y-%m-%d").date() if created else None
+        return eip, title, status, eip_type, category, authors, created_raw, created
+
+    details = parse_eip_details(file_content)
+
+    eip, title, status, eip_type, category, authors, created_raw, created = details
+    try:
+        get_redis().set(cache_key, json.dumps([eip, title, status, eip_type, category, authors, created_raw,
+                                               created.isoformat() if created else None]))
+    except redis.RedisError as ex:
+        logger.warning("Can't write EIP parse cache, error occurred: '{}'".format(ex))
+
+    return details
+
+
+def build_eip(file_name, file_download_url, file_sha, file_content):
+    """
+    Parses content of the EIP file and constructs not saved EIP model
+
+    :param file_name: name of file in EIPS folder
+    :param file_download_url: url to raw file
+    :param file_sha: git blob sha of the file
+    :param file_content: (str) markdown content of the file
+    :return: (EIP)
+    """
+    eip, title, status, eip_type, category, authors, created_raw, created = \
+        parse_eip_details_cached(file_sha, file_content)
+
+    eip_dict = {
+        'eip_num':          eip,
+        'eip_number':       EIP.number_of(eip),
+        'eip_title':        title,
+        'eip_status':       status,
+        'eip_type':         eip_type,
+        'eip_category':     category,
+        'eip_authors':      authors,
+        'eip_created_raw':  created_raw,
+        'eip_created':      created,
+
+        'file_name':            file_name,
+        'file_download_url':    file_download_url,
+        'file_content':         file_content,
+        'file_sha':             file_sha,
+    }
+
+    return EIP(**eip_dict)
+
+
 def parse_created_date(created_raw):
     format_str = "%Y-%m-%d"
     try:
         return datetime.strptime(created_raw, format_str).date()
     except Exception as ex:
-        return None
\ No newline at end of file
+        return None
+
+
+def git_blob_sha(content):
+    """
+    Computes sha of git blob locally, the same as GitHub shows for the file with this content
+
+    :param content: (str) content of the file
+    :return: (str) hex sha1
+    """
+    data = content.encode('utf-8')
+    return hashlib.sha1(b'blob ' + str(len(data)).encode('ascii') + b'\0' + data).hexdigest()
@@ -53,7 +53,8 @@ def fetch_influencers_from_hive_one():
         else:
             influencers = influencers + batch_influencers[:(current_len + len(batch_influencers) - max_influencers)]
 
-    Influencer.objects.update(score=Decimal('0'))
+    # updated_at is set explicitly, queryset update doesn't touch it and ETag of influencers is built from it
+    Influencer.objects.update(score=Decimal('0'), updated_at=timezone.now())
 
     for influencer in influencers:
         influencer_twitter_id = influencer.twitter_id
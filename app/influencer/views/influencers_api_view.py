@@ -1,14 +1,29 @@
+# Django imports
+from django.db.models import Count
+from django.db.models import Max
+from django.utils.decorators import method_decorator
+from django.views.decorators.http import condition
+
 # Pip imports
 from rest_framework import generics
 from rest_framework import permissions
 
+# Project imports
+from base.utils import construct_etag
+
 # App imports
 from ..serializers import InfluencerSerializer
 from ..models import Influencer
 
 
+def influencers_etag(request, *args, **kwargs):
+    state = Influencer.objects.aggregate(count=Count('id'), last_updated=Max('updated_at'))
+    return construct_etag(request, state['count'], state['last_updated'])
+
+
+@method_decorator(condition(etag_func=influencers_etag), name='get')
 class InfluencersAPIView(generics.ListAPIView):
 
     permission_classes = [permissions.AllowAny]
     serializer_class = InfluencerSerializer
-    queryset = Influencer.objects.order_by('-score').all()
\ No newline at end of file
+    queryset = Influencer.objects.order_by('-score').all()
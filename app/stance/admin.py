@@ -1,9 +1,10 @@
 # Django imports
 from django.contrib import admin
 from django.db import transaction
+from django.utils import timezone
 
 # Project imports
-from github_client.services import GitHubDB
+from github_client.models import GitHubOutbox
 
 # App imports
 from .models import Stance
@@ -13,21 +14,59 @@ from .models import Stance
 class StanceAdmin(admin.ModelAdmin):
     list_display = ('author',)
     list_filter = ('status', 'choice')
+    actions = ['approve_stances', 'reject_stances', 'delete_stances']
 
 
     @transaction.atomic()
     def save_model(self, request, obj, form, change):
         super().save_model(request, obj, form, change)
 
-        gh = GitHubDB()
-        if change and gh.is_model_exists(obj):
-            gh.update(obj)
-        else:
-            gh.create(obj)
+        GitHubOutbox.enqueue(updates=[obj])
 
+    @transaction.atomic()
     def delete_model(self, request, obj):
-        gh = GitHubDB()
-        if gh.is_model_exists(obj):
-            gh.delete(obj)
+        GitHubOutbox.enqueue(deletes=[obj])
 
         super().delete_model(request, obj)
+
+    def approve_stances(self, request, queryset):
+        self.moderate_stances(request, queryset, Stance.APPROVED)
+    approve_stances.short_description = "Approve selected stances"
+
+    def reject_stances(self, request, queryset):
+        self.moderate_stances(request, queryset, Stance.REJECTED)
+    reject_stances.short_description = "Reject selected stances"
+
+    @transaction.atomic()
+    def delete_stances(self, request, queryset):
+        stances = list(queryset)
+        GitHubOutbox.enqueue(deletes=stances)
+
+        queryset.delete()
+        self.message_user(request, "{} stances are deleted".format(len(stances)))
+    delete_stances.short_description = "Delete selected stances"
+
+
+    """
+    Utils / Helpers
+    """
+
+    @transaction.atomic()
+    def moderate_stances(self, request, queryset, status):
+        """
+        Sets the status to all selected stances and mirrors them on GitHub through the outbox
+        """
+        # Queryset may be filtered by status, so updated stances are read again by ids
+        ids = list(queryset.values_list('id', flat=True))
+        queryset.update(status=status, updated_at=timezone.now())
+
+        stances = list(Stance.objects.filter(id__in=ids).select_related('influencer'))
+        GitHubOutbox.enqueue(updates=stances)
+
+        self.message_user(request, "{} stances are updated".format(len(stances)))
+
+    def get_actions(self, request):
+        # Default bulk delete doesn't remove files on GitHub
+        actions = super().get_actions(request)
+        actions.pop('delete_selected', None)
+        return actions
@@ -0,0 +1,17 @@
+# Generated by Django 2.2.24 on 2026-10-18 10:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('stance', '0005_stance_author_from_social'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='stance',
+            index=models.Index(fields=['proof_type', 'proof_last_check'], name='stance_stan_proof_t_9f6402_idx'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 2.2.24 on 2026-10-18 10:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('stance', '0006_stance_proof_check_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='stance',
+            name='proof_check_scheduled_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
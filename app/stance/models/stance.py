@@ -74,12 +74,21 @@ class Stance(TimeStampedModel, GitHubCompatible):
 
     proof_last_check    = models.DateTimeField(null=True, blank=True)
 
+    """ When the check of the proof was queued, the stance is not queued again until the lease expires """
+    proof_check_scheduled_at = models.DateTimeField(null=True, blank=True)
+
     choice              = models.CharField(choices=CHOICES, max_length=7)
 
     status              = models.CharField(choices=STATUSES, max_length=8, default=PENDING)
 
     eip                 = models.ForeignKey(EIP, on_delete=models.CASCADE)
 
+    class Meta:
+        indexes = [
+            # Stances which proofs are due to check, the least recently checked first
+            models.Index(fields=['proof_type', 'proof_last_check']),
+        ]
+
     """
     
     """
@@ -3,14 +3,13 @@ from django.db import transaction
 
 # Pip imports
 from rest_framework import serializers
-from github.GithubException import GithubException
 
 # Project imports
 from base.utils import ChoiceDisplayField
 from influencer.models import Influencer
 from influencer.serializers import InfluencerSerializer
 from twitter_client.utils import weather_is_twitter_link
-from github_client.services import GitHubDB
+from github_client.models import GitHubOutbox
 from eip.models import EIP
 
 # App imports
@@ -39,12 +38,9 @@ class StanceSerializer(serializers.ModelSerializer):
     @transaction.atomic
     def create(self, validated_data):
         stance = Stance.objects.create(**validated_data)
-        gh_db = GitHubDB()
 
-        try:
-            gh_db.create(stance, "An user of platform")
-        except GithubException as ex:
-            raise serializers.ValidationError("{}".format(ex.data.get('message')))
+        # The stance is mirrored on GitHub in background, see github_client.tasks.push_github_outbox
+        GitHubOutbox.enqueue(updates=[stance])
 
         return stance
 
@@ -3,20 +3,24 @@ import logging
 from datetime import timedelta
 
 # Django imports
-from django.utils import timezone
+from django.conf import settings
 from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
 
 # Pip imports
 from celery import task
-from github.GithubException import GithubException
 
 # App imports
 from .models import Stance
 
 # Project imports
+from base.rate_limiter import TokenBucket
+from base.utils import chunks
 from twitter_client.utils import weather_is_twitter_link
 from twitter_client.utils import get_twitter_status_id
 from twitter_client.services import TwitterClient
+from github_client.models import GitHubOutbox
 from github_client.services import GitHubDB
 
 
@@ -26,51 +30,125 @@ logger = logging.getLogger(__name__)
 @task()
 def check_availability_proofs_of_stances():
     """
+    Schedules checks of Twitter stances which were not checked for a day. Stances which were checked
+    the longest time ago (or never) go first, they are split into shards checked by separate tasks.
+    All shards share the rate limit of Twitter, so they run at the speed which API allows.
+    Queued stances are leased, so they are not queued again by the next runs while the shard is waiting
+
     :return:
     """
+    stance_ids = list(due_stances().order_by(F('proof_last_check').asc(nulls_first=True), 'id')
+                      .values_list('id', flat=True))
 
-    # Returns all TWITTER Stances which were checked more than one day ago
-    yesterday = timezone.now() - timedelta(days=1)
-    stances = Stance.objects.filter(proof_type=Stance.TWITTER).exclude(proof_last_check__gt=yesterday).all()
+    for shard in chunks(stance_ids, settings.STANCE_PROOF_SHARD_SIZE):
+        lease_stances(shard)
+        check_proofs_of_stances_shard.delay(shard)
 
-    if len(stances) == 0:
-        return
 
+@task(bind=True, max_retries=None)
+def check_proofs_of_stances_shard(self, stance_ids):
+    """
+    Checks proofs of stances by batches of 100 twits per request. Every request takes a token
+    from the bucket shared by all shards, when the bucket is empty the rest of the shard
+    is retried after the rate limit window of Twitter is reset
+
+    :param stance_ids: ids of stances, ordered by priority
+    :return:
+    """
+    bucket = twitter_lookup_bucket()
     tw = TwitterClient()
     gh = GitHubDB()
 
-    for stance in stances:
-        operation = 'update'
+    for position in range(0, len(stance_ids), TwitterClient.LOOKUP_BATCH_SIZE):
+        # Stances which were checked by other task or deleted meanwhile are skipped
+        batch_ids = stance_ids[position:position + TwitterClient.LOOKUP_BATCH_SIZE]
+        batch = sorted(unchecked_stances().filter(id__in=batch_ids), key=lambda stance: batch_ids.index(stance.id))
+
+        status_ids = {
+            stance.id: get_twitter_status_id(stance.proof_url)
+            for stance in batch if weather_is_twitter_link(stance.proof_url)
+        }
+
+        statuses_exist = {}
+        if status_ids:
+            wait = bucket.acquire()
+            if wait:
+                lease_stances(stance_ids[position:])
+                raise self.retry(args=[stance_ids[position:]], countdown=wait)
+
+            statuses_exist = tw.statuses_exist(set(status_ids.values()))
+
+            # The bucket follows the rate limit reported by Twitter
+            rate_limit = tw.lookup_rate_limit()
+            if rate_limit is not None:
+                bucket.sync(rate_limit.remaining, rate_limit.reset)
+
+        # Results of the batch are stored together and mirrored on GitHub through the outbox
         try:
             with transaction.atomic():
-                # check weather the proof link was changed through admin panel to incorrect link
-                is_twitter_link = weather_is_twitter_link(stance.proof_url)
-                if not is_twitter_link:
-                    stance.proof_type = Stance.OTHER
+                changes = [check_proof_of_stance(stance, statuses_exist.get(status_ids.get(stance.id)), gh)
+                           for stance in batch]
+                files = dict(change for change in changes if change is not None)
+                GitHubOutbox.enqueue_files(files)
 
-                # if the stance is not exists => remove it
-                elif not tw.is_status_exists(get_twitter_status_id(stance.proof_url)):
-                    operation = 'delete'
+        except Exception as ex:
+            logger.error("Can't check proofs of Stances with ids '{}', cause the error occurred: '{}'".format(
+                batch_ids, ex))
 
-                    # delete stance on git hub
-                    if gh.is_model_exists(stance):
-                        gh.delete(stance)
 
-                    stance.delete()
-                    continue
+def unchecked_stances():
+    """
+    Twitter stances which were checked more than one day ago or never
+    """
+    yesterday = timezone.now() - timedelta(days=1)
+    return Stance.objects.filter(proof_type=Stance.TWITTER).exclude(proof_last_check__gt=yesterday)
 
-                stance.proof_last_check = timezone.now()
-                stance.save()
 
-                # update stance on git hub
-                if gh.is_model_exists(stance):
-                    gh.update(stance)
-                else:
-                    gh.create(stance)
+def due_stances():
+    """
+    Unchecked stances which are not queued. Stances which were not checked by the shard
+    (e.g. Twitter didn't answer) are queued again when their lease expires
+    """
+    lease_started_after = timezone.now() - timedelta(seconds=settings.STANCE_PROOF_LEASE_SECONDS)
+    return unchecked_stances().exclude(proof_check_scheduled_at__gt=lease_started_after)
 
-        except GithubException as ex:
-            logger.error("Can't {} Stance with id '{}', cause the error occurred: '{}'".format(operation, stance.id,
-                                                                                               ex.data.get('message')))
 
-        except Exception as ex:
-            logger.error("Can't {} Stance with id '{}', cause the error occurred: '{}'".format(operation, stance.id, ex))
+def lease_stances(stance_ids):
+    Stance.objects.filter(id__in=stance_ids).update(proof_check_scheduled_at=timezone.now())
+
+
+def twitter_lookup_bucket():
+    return TokenBucket('twitter:statuses/lookup', settings.TWITTER_LOOKUP_RATE_LIMIT, settings.TWITTER_RATE_LIMIT_WINDOW)
+
+
+def check_proof_of_stance(stance, is_status_exists, gh):
+    """
+    Applies result of the twit check to the stance. The file of the stance on GitHub is not written here,
+    the change is returned to be recorded with the whole batch
+
+    :param stance: (Stance) Twitter stance
+    :param is_status_exists: True / False / None if the twit was not checked
+    :param gh: (GitHubDB)
+    :return: tuple (file_path, content or None if the file is deleted) or None if nothing is changed
+    """
+    # check weather the proof link was changed through admin panel to incorrect link
+    is_twitter_link = weather_is_twitter_link(stance.proof_url)
+    if not is_twitter_link:
+        stance.proof_type = Stance.OTHER
+
+    # the twit was not checked, the stance is checked again on the next run
+    elif is_status_exists is None:
+        logger.warning("Can't check proof of Stance with id '{}', it is skipped".format(stance.id))
+        return None
+
+    # if the stance is not exists => remove it
+    elif not is_status_exists:
+        # id of the stance is reset on delete, so the path is taken before
+        file_path = gh.get_file_path(stance)
+        stance.delete()
+        return file_path, None
+
+    stance.proof_last_check = timezone.now()
+    stance.save()
+
+    return gh.get_file_path(stance), gh.get_json_content(stance)
@@ -1,8 +1,12 @@
 # Stdlib imports
+from datetime import timedelta
 from decimal import Decimal
+from unittest import mock
 
 # Django imports
 from django.conf import settings
+from django.test import override_settings
+from django.utils import timezone
 
 # Pip imports
 from rest_framework.test import APITestCase
@@ -12,11 +16,14 @@ from rest_framework import status
 # Project imports
 from eip.models import EIP
 from influencer.models import Influencer
+from github_client.models import GitHubOutbox
 from github_client.services import GitHubDB
+from github_client.tasks import push_github_outbox
 
 # App imports
 from .models import Stance
 from .tasks import check_availability_proofs_of_stances
+from .tasks import check_proofs_of_stances_shard
 
 
 
@@ -188,12 +195,13 @@ class StancesClientAPITestCase(APITestCase):
         self.assertEqual(stance_response['choice']['key'], stance_dict['choice'])
         self.assertEqual(stance_response['status']['key'], 'PENDING')
 
-        # should exists on github repo
+        # should exists on github repo after the outbox is pushed
+        push_github_outbox()
         stance = Stance.objects.get(id=stance_response['id'])
         is_exists = self.gh.is_model_exists(stance)
         self.assertTrue(is_exists)
 
-    def test_should_raise_git_hub_error(self):
+    def test_should_create_stance_while_git_hub_is_unavailable(self):
         correct_git_hub_pass = settings.GITHUB_PASSWORD
         settings.GITHUB_PASSWORD = 'not right pass'
         stance_dict = {
@@ -207,11 +215,18 @@ class StancesClientAPITestCase(APITestCase):
         url = reverse("stance:stance")
         response = self.client.post(url, data=stance_dict, format='json')
 
-        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+        # The change is kept in the outbox till GitHub accepts it
+        push_github_outbox()
+        self.assertEqual(GitHubOutbox.objects.count(), 1)
 
         # set back right password
         settings.GITHUB_PASSWORD = correct_git_hub_pass
 
+        push_github_outbox()
+        self.assertFalse(GitHubOutbox.objects.exists())
+
     def test_should_create_new_stance_with_influencer(self):
         stance_dict = {
             'author': '@maLkEvyCh',
@@ -237,7 +252,8 @@ class StancesClientAPITestCase(APITestCase):
         self.assertEqual(stance_response['choice']['key'],              stance_dict['choice'])
         self.assertEqual(stance_response['status']['key'],              'PENDING')
 
-        # should exists on github repo
+        # should exists on github repo after the outbox is pushed
+        push_github_outbox()
         stance = Stance.objects.get(id=stance_response['id'])
         is_exists = self.gh.is_model_exists(stance)
         self.assertTrue(is_exists)
@@ -259,9 +275,43 @@ class StancesClientAPITestCase(APITestCase):
         self.assertEqual(response.status_code, status.HTTP_201_CREATED)
         self.assertTrue(Stance.objects.exists())
 
-        check_availability_proofs_of_stances()
+        check_proofs_of_stances_shard([Stance.objects.get().id])
 
         self.assertFalse(Stance.objects.exists())
 
+    def test_should_schedule_least_recently_checked_stances_first(self):
+        long_ago = timezone.now() - timedelta(days=10)
+        stances = [
+            Stance.objects.create(author='author{}'.format(num), proof_type=Stance.TWITTER, choice=Stance.YAY,
+                                  proof_url='https://twitter.com/author/status/{}'.format(num), eip=self.eip,
+                                  proof_last_check=proof_last_check)
+            for num, proof_last_check in enumerate([long_ago + timedelta(days=1), None, timezone.now(), long_ago])
+        ]
+
+        with override_settings(STANCE_PROOF_SHARD_SIZE=2),\
+                mock.patch.object(check_proofs_of_stances_shard, 'delay') as delay:
+            check_availability_proofs_of_stances()
+
+        # Not checked go first, recently checked are not scheduled
+        self.assertEqual([call[0][0] for call in delay.call_args_list],
+                         [[stances[1].id, stances[3].id], [stances[0].id]])
+
+    def test_should_not_schedule_queued_stances_again(self):
+        stance = Stance.objects.create(author='author', proof_type=Stance.TWITTER, choice=Stance.YAY,
+                                       proof_url='https://twitter.com/author/status/1', eip=self.eip)
+
+        with mock.patch.object(check_proofs_of_stances_shard, 'delay') as delay:
+            check_availability_proofs_of_stances()
+            check_availability_proofs_of_stances()
+
+        self.assertEqual([call[0][0] for call in delay.call_args_list], [[stance.id]])
+
+        # The lease is expired, e.g. Twitter didn't answer for the stance
+        Stance.objects.update(proof_check_scheduled_at=timezone.now() - timedelta(days=1))
+        with mock.patch.object(check_proofs_of_stances_shard, 'delay') as delay:
+            check_availability_proofs_of_stances()
+
+        self.assertEqual(delay.call_count, 1)
+
 
 
@@ -1,12 +1,38 @@
+# Django imports
+from django.db.models import Count
+from django.db.models import Max
+from django.utils.decorators import method_decorator
+from django.views.decorators.http import condition
+
 # Pip imports
 from rest_framework import generics
 from rest_framework import permissions
 
+# Project imports
+from base.utils import construct_etag
+
 # App imports
 from ..serializers import StanceSerializer
 from ..models import Stance
 
 
+def stances_etag(request, *args, **kwargs):
+    """
+    Stances are changed with updated_at, their influencers are nested into the response
+    """
+    queryset = Stance.objects.filter(status=Stance.APPROVED)
+    eip_num = request.GET.get('eip_num', None)
+    if eip_num is not None:
+        queryset = queryset.filter(eip__eip_num=eip_num)
+
+    state = queryset.aggregate(count=Count('id'),
+                               last_updated=Max('updated_at'),
+                               influencer_last_updated=Max('influencer__updated_at'))
+
+    return construct_etag(request, state['count'], state['last_updated'], state['influencer_last_updated'])
+
+
+@method_decorator(condition(etag_func=stances_etag), name='get')
 class StancesAPIView(generics.ListCreateAPIView):
 
     permission_classes = [permissions.AllowAny]
@@ -23,5 +49,3 @@ class StancesAPIView(generics.ListCreateAPIView):
         if eip_num is not None:
             queryset = self.queryset.filter(eip__eip_num=eip_num)
         return queryset.all()
-
-
@@ -1,12 +1,28 @@
+# Django imports
+from django.utils.decorators import method_decorator
+from django.views.decorators.http import condition
+
 # Pip imports
 from rest_framework import permissions
 from rest_framework import generics
 
+# Project imports
+from base.utils import construct_etag
+
 # App imports
 from ..serializers import SystemSettingsSerializer
 from ..models import SystemSettings
 
 
+def system_settings_etag(request, *args, **kwargs):
+    """
+    Settings are one small row without updated_at, so the tag is built from its values
+    """
+    values = SystemSettings.objects.values().first() or {}
+    return construct_etag(request, *sorted(values.items()))
+
+
+@method_decorator(condition(etag_func=system_settings_etag), name='get')
 class SystemSettingsAPIView(generics.RetrieveAPIView):
     serializer_class = SystemSettingsSerializer
     permission_classes = [permissions.AllowAny]
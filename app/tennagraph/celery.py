@@ -5,6 +5,8 @@ from celery import Celery
 import logstash
 from celery.signals import after_setup_task_logger
 from celery.signals import after_setup_logger
+from celery.signals import worker_init
+from celery.signals import worker_process_shutdown
 from django.conf import settings
 
 # set the default Django settings module for the 'celery' program.
@@ -14,6 +16,8 @@ LOGSTASH_ENABLED = getattr(settings, 'LOGSTASH_ENABLED', None)
 LOGSTASH_HOST = getattr(settings, 'LOGSTASH_HOST', None)
 LOGSTASH_PORT = getattr(settings, 'LOGSTASH_PORT', None)
 
+WORKER_METRICS_PORT = getattr(settings, 'WORKER_METRICS_PORT', 0)
+
 
 def initialize_logstash(logger=None, loglevel=logging.INFO, **kwargs):
     handler = logstash.TCPLogstashHandler(LOGSTASH_HOST, LOGSTASH_PORT, tags=['celery'], message_type='celery',
@@ -27,6 +31,39 @@ if LOGSTASH_ENABLED:
     after_setup_task_logger.connect(initialize_logstash)
     after_setup_logger.connect(initialize_logstash)
 
+def start_metrics_server(**kwargs):
+    """
+    Serves /metrics of the worker, metrics of tasks (e.g. hits of GitHub cache) are counted in child processes
+    of the pool, so with prometheus_multiproc_dir they are read from files of all processes
+    """
+    from prometheus_client import REGISTRY
+    from prometheus_client import CollectorRegistry
+    from prometheus_client import multiprocess
+    from prometheus_client import start_http_server
+
+    registry = REGISTRY
+    multiproc_dir = os.environ.get('prometheus_multiproc_dir')
+    if multiproc_dir:
+        # Files of processes of the previous run would be summed up with the new ones
+        for file_name in os.listdir(multiproc_dir):
+            os.remove(os.path.join(multiproc_dir, file_name))
+
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+
+    start_http_server(WORKER_METRICS_PORT, registry=registry)
+
+
+def mark_metrics_process_dead(pid=None, **kwargs):
+    from prometheus_client import multiprocess
+    multiprocess.mark_process_dead(pid or os.getpid())
+
+
+if WORKER_METRICS_PORT:
+    worker_init.connect(start_metrics_server)
+    if os.environ.get('prometheus_multiproc_dir'):
+        worker_process_shutdown.connect(mark_metrics_process_dead)
+
 app = Celery('signals')
 
 # Using a string here means the worker don't have to serialize
@@ -36,7 +73,7 @@ app = Celery('signals')
 app.config_from_object('django.conf:settings', namespace='CELERY')
 
 # Load task modules from all registered Django app configs.
-app.autodiscover_tasks(['eip', 'influencer', 'stance', 'ethereum_client'])
+app.autodiscover_tasks(['eip', 'influencer', 'stance', 'ethereum_client', 'github_client'])
 
 
 @app.task(bind=True)
@@ -53,6 +53,7 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
     'rest_framework',
     'django_prometheus',
     'raven.contrib.django.raven_compat',
@@ -208,6 +209,62 @@ GITHUB_PASSWORD = os.environ.get('GITHUB_PASSWORD')
 GITHUB_DB_REPO = os.environ.get('GITHUB_DB_REPO')
 GITHUB_DB_BRANCH = os.environ.get('GITHUB_DB_BRANCH')
 
+# Max amount of parallel requests to GitHub while loading files
+GITHUB_FETCH_CONCURRENCY = int(os.environ.get('GITHUB_FETCH_CONCURRENCY', 8))
+
+# Responses of GitHub API are cached in redis and revalidated with ETag
+GITHUB_CACHE_ENABLED = ast.literal_eval(os.environ.get('GITHUB_CACHE_ENABLED', 'True'))
+GITHUB_CACHE_TIMEOUT = int(os.environ.get('GITHUB_CACHE_TIMEOUT', 60 * 60 * 24 * 30))
+
+# Storage of GitHubDB files: github_client.backends.RemoteGitHubBackend writes to GitHub API,
+# github_client.backends.LocalGitBackend writes to the local clone which is pushed every PUSH_GITHUB_DB_PER_SECONDS,
+# github_client.backends.InMemoryBackend keeps files in memory (tests and benchmarks)
+GITHUB_DB_BACKEND = os.environ.get('GITHUB_DB_BACKEND', 'github_client.backends.RemoteGitHubBackend')
+GITHUB_DB_LOCAL_PATH = os.environ.get('GITHUB_DB_LOCAL_PATH', os.path.join(TMP_DIR, 'github-db.git'))
+# Url to clone and push the local clone, by default it is built from GITHUB_DB_REPO.
+# Credentials (GITHUB_USERNAME, GITHUB_PASSWORD) are passed to git through the environment, not in the url
+GITHUB_DB_REMOTE_URL = os.environ.get('GITHUB_DB_REMOTE_URL', '')
+
+# Seconds after which git process (clone, fetch, push, plumbing of local repos) is killed
+GIT_COMMAND_TIMEOUT = int(os.environ.get('GIT_COMMAND_TIMEOUT', 60 * 5))
+
+# Layout of models in the repo: github_client.layouts.FileLayout stores a JSON file per model,
+# github_client.layouts.NDJSONShardLayout stores NDJSON files per range of GITHUB_DB_SHARD_SIZE ids.
+# Use migrate_github_db_layout command to move the repo to other layout
+GITHUB_DB_LAYOUT = os.environ.get('GITHUB_DB_LAYOUT', 'github_client.layouts.FileLayout')
+GITHUB_DB_SHARD_SIZE = int(os.environ.get('GITHUB_DB_SHARD_SIZE', 1000))
+
+# Changes of stances are mirrored to GitHub repo through the outbox, pushed by batches
+GITHUB_OUTBOX_BATCH_SIZE = int(os.environ.get('GITHUB_OUTBOX_BATCH_SIZE', 500))
+GITHUB_OUTBOX_LOCK_TIMEOUT = int(os.environ.get('GITHUB_OUTBOX_LOCK_TIMEOUT', 60 * 10))
+
+# Commits written by one run of the outbox push, the rest is pushed by the next run
+GITHUB_OUTBOX_MAX_WRITES = int(os.environ.get('GITHUB_OUTBOX_MAX_WRITES', 20))
+
+# Failed pushes after which the entry is a dead letter and is not pushed anymore
+GITHUB_OUTBOX_MAX_ATTEMPTS = int(os.environ.get('GITHUB_OUTBOX_MAX_ATTEMPTS', 5))
+
+# Amount of files rewritten per commit while GitHubDB repo is reconciled with the db
+GITHUB_RECONCILE_BATCH_SIZE = int(os.environ.get('GITHUB_RECONCILE_BATCH_SIZE', 500))
+
+# Amount of stances inserted per query while they are restored from GitHub repo
+GITHUB_RESTORE_BATCH_SIZE = int(os.environ.get('GITHUB_RESTORE_BATCH_SIZE', 1000))
+
+# Source of official EIPs, GitHub API (github_client.services.GitHubEIP)
+# or local mirror of the repo (github_client.services.GitMirrorEIP)
+EIPS_SOURCE = os.environ.get('EIPS_SOURCE', 'github_client.services.GitHubEIP')
+EIPS_MIRROR_REPO_URL = os.environ.get('EIPS_MIRROR_REPO_URL', 'https://github.com/ethereum/EIPs.git')
+EIPS_MIRROR_PATH = os.environ.get('EIPS_MIRROR_PATH', os.path.join(TMP_DIR, 'EIPs.git'))
+
+# Parsed details of EIP files are cached in redis by git blob sha
+EIP_PARSE_CACHE_ENABLED = ast.literal_eval(os.environ.get('EIP_PARSE_CACHE_ENABLED', 'True'))
+
+# Cached counts of EIP facets are dropped on every change of EIPs, the timeout only cleans up old entries
+EIP_FACETS_CACHE_TIMEOUT = int(os.environ.get('EIP_FACETS_CACHE_TIMEOUT', 60 * 60 * 24))
+
+# Every N-th revision of EIP content is stored in full, others are deltas against the previous revision
+EIP_REVISION_SNAPSHOT_INTERVAL = int(os.environ.get('EIP_REVISION_SNAPSHOT_INTERVAL', 20))
+
 # Celery application definition
 # http://docs.celeryproject.org/en/v4.1.0/userguide/configuration.html
 CELERY_BROKER_URL = "redis://%s:%s" % (REDIS_HOST, REDIS_PORT)
@@ -217,12 +274,19 @@ CELERY_RESULT_SERIALIZER = 'json'
 CELERY_TASK_SERIALIZER = 'json'
 CELERY_TIMEZONE = TIME_ZONE
 
+# Port of /metrics of celery workers (e.g. hits of GitHub cache), 0 disables it. Tasks run in child processes,
+# so metrics are collected from all of them when prometheus_multiproc_dir is set
+WORKER_METRICS_PORT = int(os.environ.get('WORKER_METRICS_PORT', 0))
+
 UPDATE_EIPS_PER_SECONDS = int(os.environ.get('UPDATE_EIPS_PER_SECONDS'))
 UPDATE_INFLUENCERS_PER_SECONDS = int(os.environ.get('UPDATE_INFLUENCERS_PER_SECONDS'))
 UPDATE_PROOFS_AVAILABILITY_PER_SECONDS = int(os.environ.get('UPDATE_PROOFS_AVAILABILITY_PER_SECONDS'))
 FETCH_TRANSACTIONS_PER_SECONDS = int(os.environ.get('FETCH_TRANSACTIONS_PER_SECONDS'))
 LOAD_VOTING_DETAILS_PER_SECONDS = 60
 LOAD_VOTES_PER_SECONDS = 60
+PUSH_GITHUB_OUTBOX_PER_SECONDS = int(os.environ.get('PUSH_GITHUB_OUTBOX_PER_SECONDS', 10))
+PUSH_GITHUB_DB_PER_SECONDS = int(os.environ.get('PUSH_GITHUB_DB_PER_SECONDS', 60 * 5))
+RECONCILE_GITHUB_DB_PER_SECONDS = int(os.environ.get('RECONCILE_GITHUB_DB_PER_SECONDS', 60 * 60 * 24))
 
 CELERY_BEAT_SCHEDULE = {
     'fetch_eips_from_official_repo': {
@@ -249,6 +313,18 @@ CELERY_BEAT_SCHEDULE = {
         'task': 'ethereum_client.tasks.load_votes',
         'schedule': schedule(run_every=LOAD_VOTES_PER_SECONDS),
     },
+    'push_github_outbox': {
+        'task': 'github_client.tasks.push_github_outbox',
+        'schedule': schedule(run_every=PUSH_GITHUB_OUTBOX_PER_SECONDS),
+    },
+    'push_github_db': {
+        'task': 'github_client.tasks.push_github_db',
+        'schedule': schedule(run_every=PUSH_GITHUB_DB_PER_SECONDS),
+    },
+    'reconcile_github_db': {
+        'task': 'github_client.tasks.reconcile_github_db',
+        'schedule': schedule(run_every=RECONCILE_GITHUB_DB_PER_SECONDS),
+    },
 }
 
 # Gunicorn settings
@@ -345,6 +421,16 @@ TWITTER_CONSUMER_SECRET_KEY = os.environ.get('TWITTER_CONSUMER_SECRET_KEY')
 TWITTER_ACCESS_TOKEN_KEY = os.environ.get('TWITTER_ACCESS_TOKEN_KEY')
 TWITTER_ACCESS_TOKEN_SECRET_KEY = os.environ.get('TWITTER_ACCESS_TOKEN_SECRET_KEY')
 
+# Requests of statuses/lookup per rate limit window of Twitter (15 minutes), shared by all workers
+TWITTER_LOOKUP_RATE_LIMIT = int(os.environ.get('TWITTER_LOOKUP_RATE_LIMIT', 900))
+TWITTER_RATE_LIMIT_WINDOW = int(os.environ.get('TWITTER_RATE_LIMIT_WINDOW', 60 * 15))
+
+# Amount of stances checked by one task of proofs check
+STANCE_PROOF_SHARD_SIZE = int(os.environ.get('STANCE_PROOF_SHARD_SIZE', 1000))
+
+# Seconds while queued check of a stance is not queued again, it is renewed while the shard waits for the rate limit
+STANCE_PROOF_LEASE_SECONDS = int(os.environ.get('STANCE_PROOF_LEASE_SECONDS', 60 * 30))
+
 # Ethereum
 ETHEREUM_URL_WEB3_PROVIDER = os.environ.get('ETHEREUM_URL_WEB3_PROVIDER')
 BLOCKSCOUT_BASE_URL = os.environ.get('BLOCKSCOUT_BASE_URL')
@@ -7,6 +7,9 @@ from django.conf import settings
 # Pip imports
 import twitter
 
+# Project imports
+from base.utils import chunks
+
 logger = logging.getLogger(__name__)
 
 
@@ -14,11 +17,17 @@ class TwitterClient:
 
     api = None
 
-    def __init__(self):
+    # Max amount of statuses loaded with one request of statuses/lookup
+    LOOKUP_BATCH_SIZE = 100
+
+    LOOKUP_PATH = '/statuses/lookup.json'
+
+    def __init__(self, base_url=None):
         self.api = twitter.Api(consumer_key=settings.TWITTER_CONSUMER_KEY,
                                       consumer_secret=settings.TWITTER_CONSUMER_SECRET_KEY,
                                       access_token_key=settings.TWITTER_ACCESS_TOKEN_KEY,
-                                      access_token_secret=settings.TWITTER_ACCESS_TOKEN_SECRET_KEY)
+                                      access_token_secret=settings.TWITTER_ACCESS_TOKEN_SECRET_KEY,
+                                      base_url=base_url)
 
     def verification(self):
         return self.api.VerifyCredentials()
@@ -49,3 +58,42 @@ class TwitterClient:
             logger.error("Can't load twit, en error occurred: {}".format(ex))
 
         return None
+
+    def statuses_exist(self, status_ids):
+        """
+        Checks statuses with statuses/lookup, one request per 100 statuses.
+        Values are the same as is_status_exists returns, if the request of a batch fails
+        all statuses of this batch are None
+
+        :param status_ids: list of status ids
+        :return: dict {status_id: True / False / None}
+        """
+        result = {}
+
+        for batch in chunks(list(status_ids), self.LOOKUP_BATCH_SIZE):
+            try:
+                statuses = self.api.GetStatuses([int(status_id) for status_id in batch],
+                                                trim_user=True, include_entities=False, map=True)
+            except Exception as ex:
+                logger.error("Can't lookup twits, an error occurred: {}".format(ex))
+                result.update({status_id: None for status_id in batch})
+                continue
+
+            # Not found statuses are in the map with None, missing keys are unknown
+            for status_id in batch:
+                status = statuses.get(int(status_id), False)
+                result[status_id] = None if status is False else status is not None
+
+        return result
+
+    def lookup_rate_limit(self):
+        """
+        Rate limit of statuses/lookup reported by Twitter in headers of the last response
+
+        :return: EndpointRateLimit(limit, remaining, reset) or None if it is not known yet
+        """
+        rate_limit = self.api.rate_limit.get_limit(self.api.base_url + self.LOOKUP_PATH)
+        if not rate_limit.reset:
+            return None
+
+        return rate_limit
@@ -1,3 +1,14 @@
+# Stdlib imports
+import json
+import threading
+from http.server import BaseHTTPRequestHandler
+from http.server import HTTPServer
+from urllib.parse import parse_qs
+from urllib.parse import urlparse
+
+# Django imports
+from django.test import override_settings
+
 # Pip imports
 from rest_framework.test import APITestCase
 import twitter
@@ -50,6 +61,81 @@ class TwitterClientAPITestCase(APITestCase):
         self.assertFalse(is_status_exists)
 
 
+class FakeTwitterAPIHandler(BaseHTTPRequestHandler):
+    """
+    Answers statuses/lookup with map=true: existing statuses are the odd ids, status 500 fails the whole request
+    """
+
+    requests_count = 0
+
+    def do_GET(self):
+        FakeTwitterAPIHandler.requests_count += 1
+
+        url = urlparse(self.path)
+        status_ids = parse_qs(url.query)['id'][0].split(',')
+
+        if url.path != '/statuses/lookup.json' or '500' in status_ids:
+            self.send_response(500)
+            self.end_headers()
+            return
+
+        body = {'id': {
+            status_id: {'id': int(status_id), 'text': 'Twit'} if int(status_id) % 2 else None
+            for status_id in status_ids
+        }}
+
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.end_headers()
+        self.wfile.write(json.dumps(body).encode('utf-8'))
+
+    def log_message(self, format, *args):
+        pass
+
+
+@override_settings(TWITTER_CONSUMER_KEY='key', TWITTER_CONSUMER_SECRET_KEY='secret',
+                   TWITTER_ACCESS_TOKEN_KEY='token', TWITTER_ACCESS_TOKEN_SECRET_KEY='token-secret')
+class TwitterClientLookupTestCase(APITestCase):
+
+    server = None
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.server = HTTPServer(('127.0.0.1', 0), FakeTwitterAPIHandler)
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+        super().tearDownClass()
+
+    def setUp(self):
+        FakeTwitterAPIHandler.requests_count = 0
+        self.twitter = TwitterClient(base_url='http://127.0.0.1:{}'.format(self.server.server_port))
+
+    def test_should_lookup_statuses_by_batches(self):
+        status_ids = [str(status_id) for status_id in range(1, 251)]
+
+        statuses_exist = self.twitter.statuses_exist(status_ids)
+
+        self.assertEqual(FakeTwitterAPIHandler.requests_count, 3)
+        self.assertTrue(statuses_exist['1'])
+        self.assertFalse(statuses_exist['2'])
+        self.assertEqual(len(statuses_exist), 250)
+
+    def test_should_return_none_for_failed_batch(self):
+        status_ids = [str(status_id) for status_id in range(301, 501)]
+
+        statuses_exist = self.twitter.statuses_exist(status_ids)
+
+        # The second batch contains 500 and fails, the first one is checked
+        self.assertTrue(statuses_exist['301'])
+        self.assertIsNone(statuses_exist['401'])
+        self.assertIsNone(statuses_exist['500'])
+
+
 class TwitterUtilsTestCase(APITestCase):
 
     def test_should_be_twitter_link(self):